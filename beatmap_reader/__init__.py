@@ -1,6 +1,11 @@
-from .objects import SongsFolder, Beatmapset, Beatmap
+from .objects import SongsFolder, Beatmapset, Beatmap, TimingPoint, TimingPointList
 from .read import SongsReader, BeatmapsetReader, BeatmapReader
-from .hit_objects import HitObjectBase, HitCircle, Slider, Spinner, ManiaHoldKey
+from .manifest import LibraryManifest
+from .object_cache import ObjectCache
+from .path import SliderPathCache, PathPrecision, DEFAULT_PRECISION, FAST_PRECISION, global_path_cache
+from .hit_objects import (
+    HitObjectList, HitObjectColumns, HitObjectBase, HitCircle, Slider, Spinner, ManiaHoldKey, HitObjectError
+)
 from .util import *
 from .enums import *
 from .database import *
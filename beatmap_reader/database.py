@@ -1,7 +1,13 @@
+import hashlib
+import mmap
+import os
 import struct
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import IntEnum
 from .enums import GameMode, Mods
-from typing import Union, IO, Sequence
+from typing import Union, IO, Sequence, Iterable
+import numpy as np
 
 
 class VersionChanges:
@@ -35,63 +41,148 @@ class ByteType(IntEnum):
     SERIALIZABLE = 19
 
 
+STAR_RATINGS_DTYPE = np.dtype([("mods", "<i4"), ("stars", "<f8")])
+STAR_RATING_MODES = ("dict", "array", "skip")
+_mods_cache = {}
+
+
+def get_mods(value) -> Mods:
+    # Constructing Mods is slow, so reuse them since only a few combinations show up
+    mods = _mods_cache.get(value)
+    if mods is None:
+        mods = _mods_cache[value] = Mods(value)
+    return mods
+
+
 class Buffer:
-    def __init__(self, buf: IO):
-        self.buf = buf
+    """
+    Decodes values from a buffer at a moving offset. An IO object is read in full
+    up front, and Buffer.from_path memory maps the file instead.
+    """
+
+    SBYTE = struct.Struct("<b")
+    UBYTE = struct.Struct("<B")
+    CHAR = struct.Struct("<c")
+    SHORT = struct.Struct("<h")
+    USHORT = struct.Struct("<H")
+    INT = struct.Struct("<i")
+    UINT = struct.Struct("<I")
+    LONG = struct.Struct("<q")
+    ULONG = struct.Struct("<Q")
+    FLOAT = struct.Struct("<f")
+    DOUBLE = struct.Struct("<d")
+    TIMING_POINT = struct.Struct("<dd?")
+    # Entries of the int (mods) -> double/float (star rating) dictionaries in osu!.db
+    STAR_RATING_ENTRIES = {
+        ByteType.DOUBLE: struct.Struct("<BiBd"),
+        ByteType.FLOAT: struct.Struct("<BiBf"),
+    }
+    STAR_RATING_ENTRY_DTYPES = {
+        ByteType.DOUBLE: np.dtype([("key_type", "u1"), ("mods", "<i4"), ("value_type", "u1"), ("stars", "<f8")]),
+        ByteType.FLOAT: np.dtype([("key_type", "u1"), ("mods", "<i4"), ("value_type", "u1"), ("stars", "<f4")]),
+    }
+    # Number of bytes read_object reads after the type byte for each fixed width type
+    OBJECT_SIZES = {
+        ByteType.NULL: 0, ByteType.BOOL: 1, ByteType.UBYTE: 1, ByteType.USHORT: 2, ByteType.UINT: 4,
+        ByteType.ULONG: 8, ByteType.SBYTE: 1, ByteType.SHORT: 2, ByteType.INT: 4, ByteType.LONG: 8,
+        ByteType.CHAR: 1, ByteType.FLOAT: 4, ByteType.DOUBLE: 8, ByteType.DECIMAL: 0,
+        ByteType.DATE_TIME: 8, ByteType.BYTES: 0
+    }
+
+    def __init__(self, buf: Union[IO, bytes, bytearray, memoryview, mmap.mmap]):
+        if hasattr(buf, "read") and not isinstance(buf, mmap.mmap):
+            buf = buf.read()
+        self.view = memoryview(buf)
+        self.offset = 0
+        # Set by from_path, so worker processes can map the same file
+        self.path = None
+
+    @classmethod
+    def from_path(cls, path: str):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                buffer = cls(b"")
+            else:
+                buffer = cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        buffer.path = path
+        return buffer
+
+    def at(self, offset):
+        """
+        Returns a Buffer over the same data starting at offset. Reading from it doesn't
+        move this buffer's offset, so a shared buffer can be read by several threads.
+        """
+        buffer = Buffer(self.view)
+        buffer.offset = offset
+        buffer.path = self.path
+        return buffer
 
-    def _read(self, fmt, size):
-        data = struct.unpack(fmt, self.buf.read(size))[0]
+    def _read(self, fmt: struct.Struct):
+        data = fmt.unpack_from(self.view, self.offset)[0]
+        self.offset += fmt.size
+        return data
+
+    def read_struct(self, fmt: struct.Struct):
+        """Reads a run of fixed width values described by a precompiled struct."""
+        data = fmt.unpack_from(self.view, self.offset)
+        self.offset += fmt.size
         return data
 
     def _read_raw(self, size):
-        data = self.buf.read(size)
+        if self.offset + size > len(self.view):
+            raise struct.error(f"unpack requires a buffer of {size} bytes")
+        data = self.view[self.offset:self.offset+size]
+        self.offset += size
         return data
 
+    def skip(self, size):
+        self.offset += size
+
     def read_raw_bytes(self, size):
-        return self._read_raw(size)
+        return self._read_raw(size).tobytes()
 
     def read_sbyte(self):
-        return self._read("<b", 1)
+        return self._read(self.SBYTE)
 
     def read_ubyte(self):
-        return self._read("<B", 1)
+        return self._read(self.UBYTE)
 
     def read_bool(self):
         return bool(self.read_ubyte())
 
     def read_char(self):
-        return self._read("<c", 1)
+        return self._read(self.CHAR)
 
     def read_short(self):
-        return self._read("<h", 2)
+        return self._read(self.SHORT)
 
     def read_ushort(self):
-        return self._read("<H", 2)
+        return self._read(self.USHORT)
 
     def read_int(self):
-        return self._read("<i", 4)
+        return self._read(self.INT)
 
     def read_uint(self):
-        return self._read("<I", 4)
+        return self._read(self.UINT)
 
     def read_long(self):
-        return self._read("<q", 8)
+        return self._read(self.LONG)
 
     def read_ulong(self):
-        return self._read("<Q", 8)
+        return self._read(self.ULONG)
 
     def read_float(self):
-        return self._read("<f", 4)
+        return self._read(self.FLOAT)
 
     def read_double(self):
-        return self._read("<d", 8)
+        return self._read(self.DOUBLE)
 
     def read_byte_array(self):
         length = self.read_int()
         return self.read_raw_bytes(length) if length > 0 else None
 
     def _read_chars(self, length):
-        return self.read_raw_bytes(length).decode('utf-8')
+        return str(self._read_raw(length), "utf-8")
 
     def read_chars(self):
         length = self.read_int()
@@ -101,7 +192,8 @@ class Buffer:
         result = 0
         shift = 0
         while True:
-            byte = self.read_ubyte()
+            byte = self.view[self.offset]
+            self.offset += 1
             result |= (byte & 0b01111111) << shift
             if (byte & 0b10000000) == 0x00:
                 break
@@ -111,28 +203,102 @@ class Buffer:
     def read_string(self):
         if self.read_ubyte() != 0x0B:
             return
-        length = self.read_ulb128()
-        return self.read_raw_bytes(length).decode('utf-8')
+        return self._read_chars(self.read_ulb128())
+
+    def skip_string(self):
+        if self.read_ubyte() == 0x0B:
+            length = self.read_ulb128()
+            self.offset += length
 
     def read_date_time(self):
         return self.read_long()
 
     def read_object(self):
-        obj_type = ByteType(self.read_ubyte())
+        obj_type = self.read_ubyte()
+        reader = self.OBJECT_READERS.get(obj_type)
+        if reader is not None:
+            return reader(self)
+        obj_type = ByteType(obj_type)
         if obj_type == ByteType.NULL:
             return
-        if obj_type == ByteType.UNKNOWN or obj_type == ByteType.SERIALIZABLE:
-            raise NotImplementedError()
-        return getattr(self, "read_"+obj_type.name.lower(), lambda: None)()
+        raise NotImplementedError()
+
+    def skip_object(self):
+        obj_type = self.read_ubyte()
+        size = self.OBJECT_SIZES.get(obj_type)
+        if size is not None:
+            self.offset += size
+            return
+        self.offset -= 1
+        self.read_object()
+
+    def skip_dictionary(self):
+        count = self.read_int()
+        if count <= 0:
+            return
+        key_size = self.OBJECT_SIZES.get(self.view[self.offset])
+        value_size = self.OBJECT_SIZES.get(self.view[self.offset + 1 + key_size]) if key_size is not None else None
+        if value_size is None:
+            for _ in range(count):
+                self.skip_object()
+                self.skip_object()
+            return
+        # Entries are fixed width (the int -> double star ratings in osu!.db), so jump over all of them
+        self.offset += (2 + key_size + value_size) * count
 
     def read_dictionary(self, key_map=lambda x: x, value_map=lambda x: x):
         return {key_map(self.read_object()): value_map(self.read_object()) for _ in range(self.read_int())}
 
+    def read_star_ratings(self, as_array=False):
+        """
+        Fast path for the star rating dictionaries of osu!.db. Returns a dict of Mods to
+        star rating, or a STAR_RATINGS_DTYPE array if as_array is True. Falls back to
+        read_dictionary if the entries aren't laid out as int -> double/float.
+        """
+        start = self.offset
+        count = self.read_int()
+        if count <= 0:
+            return np.zeros(0, dtype=STAR_RATINGS_DTYPE) if as_array else {}
+        value_type = self.view[self.offset + 5] if self.offset + 5 < len(self.view) else None
+        entry = self.STAR_RATING_ENTRIES.get(value_type)
+        if entry is not None:
+            data = self._read_raw(entry.size * count)
+            if as_array:
+                entries = np.frombuffer(data, dtype=self.STAR_RATING_ENTRY_DTYPES[value_type])
+                if np.all(entries["key_type"] == ByteType.INT) and np.all(entries["value_type"] == value_type):
+                    ratings = np.empty(count, dtype=STAR_RATINGS_DTYPE)
+                    ratings["mods"] = entries["mods"]
+                    ratings["stars"] = entries["stars"]
+                    return ratings
+            else:
+                ratings = {}
+                for key_type, mods, entry_value_type, stars in entry.iter_unpack(data):
+                    if key_type != ByteType.INT or entry_value_type != value_type:
+                        break
+                    ratings[get_mods(mods)] = stars
+                else:
+                    return ratings
+        # Unexpected layout
+        self.offset = start
+        ratings = self.read_dictionary(get_mods)
+        if as_array:
+            return np.array(list(ratings.items()), dtype=STAR_RATINGS_DTYPE)
+        return ratings
+
     def read_timing_point(self):
-        bpm = self.read_double()
-        offset = self.read_double()
-        inherited = self.read_bool()
-        return bpm, offset, inherited
+        return self.read_struct(self.TIMING_POINT)
+
+    def read_timing_points(self, count):
+        data = self._read_raw(self.TIMING_POINT.size * count)
+        return list(self.TIMING_POINT.iter_unpack(data))
+
+
+# The read method of each type read_object handles, built once instead of for every Buffer
+Buffer.OBJECT_READERS = {
+    obj_type: getattr(Buffer, "read_"+obj_type.name.lower(), lambda self: None)
+    for obj_type in ByteType
+    if obj_type not in (ByteType.NULL, ByteType.UNKNOWN, ByteType.SERIALIZABLE)
+}
 
 
 class Collections:
@@ -147,13 +313,14 @@ class Collections:
                             for _ in range(collection_buffer.read_uint())]
 
     def replace_beatmap_hashes(self, osu_cache: Union['OsuCache', IO, Buffer]):
+        # Parse the osu!.db once for every collection
+        osu_cache = OsuCache.ensure(osu_cache)
         for collection in self.collections:
             collection.replace_beatmap_hashes(osu_cache)
 
     @classmethod
     def from_path(cls, path: str):
-        with open(path, "rb") as f:
-            return cls(f)
+        return cls(Buffer.from_path(path))
 
 
 class Collection:
@@ -165,20 +332,31 @@ class Collection:
             collection_buffer.read_string() for _ in range(collection_buffer.read_uint())]
 
     def replace_beatmap_hashes(self, osu_cache: Union['OsuCache', IO, Buffer]):
-        if not isinstance(osu_cache, OsuCache):
-            if not isinstance(osu_cache, Buffer):
-                osu_cache = Buffer(osu_cache)
-            osu_cache = OsuCache(osu_cache)
+        osu_cache = OsuCache.ensure(osu_cache)
         self.beatmaps = [osu_cache.get_beatmap_from_hash(bm_hash) for bm_hash in self.beatmaps]
 
 
+OsuCacheDiff = namedtuple("OsuCacheDiff", ("added", "removed", "modified"))
+
+
 class OsuCache:
     __slots__ = (
         "version", "folder_count", "account_unlocked", "account_unlocked_date",
-        "username", "beatmaps"
+        "username", "beatmaps", "_indexes", "_path", "_records_offset", "_file_stat", "_digests"
     )
+    # Groups holding md5_hash, beatmap_id/beatmapset_id and folder_name
+    INDEX_GROUPS = ("metadata", "ids", "extra")
 
-    def __init__(self, buffer: Union[IO, Buffer]):
+    def __init__(self, buffer: Union[IO, Buffer], lazy=False, groups=None, star_ratings="dict"):
+        """
+        If lazy is True, the records are only skip-scanned to build an offset index and
+        beatmaps is a BeatmapCacheList that decodes each one when it's accessed.
+        groups limits decoding to the given BeatmapCache.GROUPS.
+        star_ratings is one of STAR_RATING_MODES: "dict" decodes the star ratings into
+        dicts of Mods, "array" into STAR_RATINGS_DTYPE arrays, and "skip" leaves them as None.
+        """
+        if star_ratings not in STAR_RATING_MODES:
+            raise ValueError(f"Invalid star_ratings {star_ratings!r}, must be one of {STAR_RATING_MODES}")
         if not isinstance(buffer, Buffer):
             buffer = Buffer(buffer)
 
@@ -187,17 +365,190 @@ class OsuCache:
         self.account_unlocked = buffer.read_bool()
         self.account_unlocked_date = buffer.read_date_time()
         self.username = buffer.read_string()
-        self.beatmaps = [BeatmapCache(buffer, self.version) for _ in range(buffer.read_uint())]
+        self._indexes = None
+        count = buffer.read_uint()
+        # Only lazy caches keep the buffer. The rest keep a digest of every record for
+        # diff, and read the records again from _path if the file hasn't changed since
+        self._path = buffer.path
+        self._file_stat = _get_file_stat(buffer.path)
+        self._records_offset = buffer.offset
+        self._digests = None
+        if lazy:
+            self.beatmaps = BeatmapCacheList(buffer, self.version, count, groups, star_ratings)
+        else:
+            offsets = []
+            self.beatmaps = []
+            for _ in range(count):
+                offsets.append(buffer.offset)
+                self.beatmaps.append(BeatmapCache(buffer, self.version, groups, star_ratings))
+            offsets.append(buffer.offset)
+            self._digests = get_record_digests(buffer.view, offsets)
 
     @classmethod
     def from_path(cls, path: str):
-        with open(path, "rb") as f:
-            return cls(f)
+        return cls(Buffer.from_path(path))
+
+    @classmethod
+    def open(cls, path: str, lazy=True, groups=None, star_ratings="dict"):
+        return cls(Buffer.from_path(path), lazy, groups, star_ratings)
+
+    @classmethod
+    def ensure(cls, osu_cache: Union['OsuCache', IO, Buffer]) -> 'OsuCache':
+        if isinstance(osu_cache, OsuCache):
+            return osu_cache
+        return cls(osu_cache, lazy=True)
+
+    @classmethod
+    def load_parallel(cls, path: str, workers=None, groups=None, star_ratings="dict", use_threads=False):
+        """
+        Decodes an osu!.db in two phases: the records are skip-scanned for their offsets
+        (as for a lazy cache), then ranges of records are decoded across a pool of worker
+        processes, each with its own mmap of the file, and joined back together in order.
+        use_threads uses a thread pool over the same buffer instead.
+
+        The records are pickled to send them back from the workers, which costs more than
+        decoding them, so this is only faster with several cores to spare. See
+        test_parallel_decode.py for timings.
+        """
+        osu_cache = cls.open(path, True, groups, star_ratings)
+        chunks = osu_cache._decode_in_pool(osu_cache.beatmaps.buffer, osu_cache.beatmaps.offsets, workers,
+                                           use_threads, groups, star_ratings)
+        osu_cache._get_digests()
+        osu_cache.beatmaps = [beatmap for chunk in chunks for beatmap in chunk]
+        return osu_cache
+
+    def to_columns(self, parallel=False, workers=None, use_threads=False) -> 'OsuCacheColumns':
+        """
+        Decodes every record straight into an OsuCacheColumns, without creating any
+        BeatmapCache objects. If parallel is True, ranges of records are decoded across
+        a pool like load_parallel and the columns are joined in order.
+
+        An OsuCache that isn't lazy maps its file again from the path it was opened from,
+        which raises a ValueError if the file has changed since it was loaded.
+        """
+        buffer = self._get_buffer()
+        if not parallel or len(self.beatmaps) == 0:
+            return OsuCacheColumns.decode(buffer.at(self._records_offset), self.version, len(self.beatmaps))
+        return OsuCacheColumns.concat(self._decode_in_pool(buffer, self._get_offsets(buffer), workers, use_threads,
+                                                           columns=True))
+
+    def diff(self, other: 'OsuCache') -> 'OsuCacheDiff':
+        """
+        Compares this osu!.db with a newer one. Records are matched on a digest of their
+        raw bytes first, so unchanged records are never decoded; only the rest are
+        decoded and paired up by md5 hash, then by beatmap id, to tell modified beatmaps
+        apart from added and removed ones. modified holds (old, new) pairs.
+
+        An OsuCache that isn't lazy compares the digests it took when it was loaded, so
+        it can be compared with a newer version of the file it was loaded from.
+        """
+        digests = self._get_digests()
+        order = np.argsort(digests, kind="stable")
+        sorted_digests = digests[order]
+        other_digests = other._get_digests()
+        lows = np.searchsorted(sorted_digests, other_digests, "left").tolist()
+        highs = np.searchsorted(sorted_digests, other_digests, "right").tolist()
 
-    def get_beatmap_from_hash(self, md5_hash):
-        for beatmap in self.beatmaps:
-            if beatmap.md5_hash == md5_hash:
-                return beatmap
+        matched = np.zeros(len(digests), dtype=bool)
+        unmatched_other = []
+        for j, (low, high) in enumerate(zip(lows, highs)):
+            for i in order[low:high].tolist():
+                if not matched[i]:
+                    matched[i] = True
+                    break
+            else:
+                unmatched_other.append(j)
+
+        removed = {i: self.beatmaps[i] for i in np.flatnonzero(~matched).tolist()}
+        by_hash = {beatmap.md5_hash: i for i, beatmap in removed.items()}
+        by_id = {beatmap.beatmap_id: i for i, beatmap in removed.items() if beatmap.beatmap_id}
+        added, modified = [], []
+        for j in unmatched_other:
+            beatmap = other.beatmaps[j]
+            i = by_hash.get(beatmap.md5_hash)
+            if i is None or i not in removed:
+                i = by_id.get(beatmap.beatmap_id) if beatmap.beatmap_id else None
+            if i is not None and i in removed:
+                modified.append((removed.pop(i), beatmap))
+            else:
+                added.append(beatmap)
+        return OsuCacheDiff(added, list(removed.values()), modified)
+
+    def _get_buffer(self) -> Buffer:
+        if isinstance(self.beatmaps, BeatmapCacheList):
+            return self.beatmaps.buffer
+        if self._path is None:
+            raise ValueError("Reading the records again needs a lazy OsuCache or one opened from a path")
+        if _get_file_stat(self._path) != self._file_stat:
+            raise ValueError(f"{self._path} has changed since it was loaded, open it again to read it")
+        return Buffer.from_path(self._path)
+
+    def _get_digests(self) -> np.ndarray:
+        if self._digests is None:
+            self._digests = get_record_digests(self.beatmaps.buffer.view, self.beatmaps.offsets.tolist())
+        return self._digests
+
+    def _get_offsets(self, buffer):
+        if isinstance(self.beatmaps, BeatmapCacheList):
+            return self.beatmaps.offsets
+        return scan_record_offsets(buffer.at(self._records_offset), self.version, len(self.beatmaps))
+
+    def _decode_in_pool(self, buffer, offsets, workers, use_threads, groups=None, star_ratings="dict",
+                        columns=False):
+        if use_threads:
+            source = buffer.view
+        elif buffer.path is not None:
+            source = buffer.path
+        else:
+            raise ValueError("Decoding in worker processes needs an OsuCache opened from a path")
+        count = len(offsets) - 1
+        # A few ranges per worker so one slow range doesn't hold up the rest
+        chunk_count = max(1, min(count, (workers or os.cpu_count() or 1) * 4))
+        bounds = np.linspace(0, count, chunk_count + 1).astype(np.int64).tolist()
+        executor_cls = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+        with executor_cls(workers) as executor:
+            futures = [
+                executor.submit(_decode_record_range, source, self.version, int(offsets[start]), end - start,
+                                groups, star_ratings, columns)
+                for start, end in zip(bounds, bounds[1:]) if end > start
+            ]
+            return [future.result() for future in futures]
+
+    def _get_indexes(self):
+        """
+        Builds the md5, beatmap id, beatmapset id and folder name indexes (mapping to
+        record indexes) the first time they're needed. Lazy caches only decode the
+        groups that hold those fields.
+        """
+        if self._indexes is not None:
+            return self._indexes
+        md5_index, id_index, set_index, folder_index = {}, {}, {}, {}
+        if isinstance(self.beatmaps, BeatmapCacheList):
+            records = (self.beatmaps.get(i, self.INDEX_GROUPS) for i in range(len(self.beatmaps)))
+        else:
+            records = self.beatmaps
+        for i, beatmap in enumerate(records):
+            # Keep the first record for duplicate keys, like a linear search would
+            md5_index.setdefault(beatmap.md5_hash, i)
+            id_index.setdefault(beatmap.beatmap_id, i)
+            set_index.setdefault(beatmap.beatmapset_id, []).append(i)
+            folder_index.setdefault(beatmap.folder_name, []).append(i)
+        self._indexes = md5_index, id_index, set_index, folder_index
+        return self._indexes
+
+    def get_beatmap_from_hash(self, md5_hash) -> Union['BeatmapCache', None]:
+        index = self._get_indexes()[0].get(md5_hash)
+        return self.beatmaps[index] if index is not None else None
+
+    def get_beatmap_from_id(self, beatmap_id) -> Union['BeatmapCache', None]:
+        index = self._get_indexes()[1].get(beatmap_id)
+        return self.beatmaps[index] if index is not None else None
+
+    def get_beatmaps_from_set_id(self, beatmapset_id) -> Sequence['BeatmapCache']:
+        return [self.beatmaps[i] for i in self._get_indexes()[2].get(beatmapset_id, ())]
+
+    def get_beatmaps_from_folder(self, folder_name) -> Sequence['BeatmapCache']:
+        return [self.beatmaps[i] for i in self._get_indexes()[3].get(folder_name, ())]
 
 
 class BeatmapCache:
@@ -214,12 +565,62 @@ class BeatmapCache:
         "mania_scroll_speed"
     )
 
-    def __init__(self, buffer: Union[IO, Buffer], version):
+    # Runs of fixed width fields, read with a single unpack each
+    COUNTS = struct.Struct("<B3Hq")
+    FLOAT_DIFFICULTY = struct.Struct("<4fd")
+    INT_DIFFICULTY = struct.Struct("<4Bd")
+    TIMES = struct.Struct("<3I")
+    IDS = struct.Struct("<3I4BhfB")
+    PLAY_STATE = struct.Struct("<?q?")
+    OPTIONS = struct.Struct("<q5?")
+    LAST_EDIT = struct.Struct("<iB")
+
+    GROUPS = ("metadata", "stats", "star_ratings", "timing", "ids", "extra")
+
+    def __init__(self, buffer: Union[IO, Buffer], version, groups=None, star_ratings="dict"):
+        """
+        groups is an optional collection of GROUPS to decode. The fields of any other
+        group are skipped over and left unset. See OsuCache for star_ratings.
+        """
         if not isinstance(buffer, Buffer):
             buffer = Buffer(buffer)
 
         if VersionChanges.ENTRY_LENGTH_MIN <= version < VersionChanges.ENTRY_LENGTH_MAX:
             buffer.read_uint()
+        if groups is None:
+            self._read_metadata(buffer, version)
+            self._read_stats(buffer, version)
+            self._read_star_ratings(buffer, version, star_ratings)
+            self._read_timing(buffer, version)
+            self._read_ids(buffer, version)
+            self._read_extra(buffer, version)
+            return
+        for group, read, skip in (
+            ("metadata", self._read_metadata, self._skip_metadata),
+            ("stats", self._read_stats, self._skip_stats),
+            ("star_ratings", lambda buffer, version: self._read_star_ratings(buffer, version, star_ratings),
+             self._skip_star_ratings),
+            ("timing", self._read_timing, self._skip_timing),
+            ("ids", self._read_ids, self._skip_ids),
+            ("extra", self._read_extra, self._skip_extra),
+        ):
+            read(buffer, version) if group in groups else skip(buffer, version)
+
+    @classmethod
+    def skip(cls, buffer: Buffer, version):
+        """Moves the buffer past a record while decoding as little as possible."""
+        if VersionChanges.ENTRY_LENGTH_MIN <= version < VersionChanges.ENTRY_LENGTH_MAX:
+            # These versions store the size of each entry
+            buffer.skip(buffer.read_uint())
+            return
+        cls._skip_metadata(buffer, version)
+        cls._skip_stats(buffer, version)
+        cls._skip_star_ratings(buffer, version)
+        cls._skip_timing(buffer, version)
+        cls._skip_ids(buffer, version)
+        cls._skip_extra(buffer, version)
+
+    def _read_metadata(self, buffer, version):
         self.artist = buffer.read_string()
         if version >= VersionChanges.FIRST_OSZ_2:
             self.artist_unicode = buffer.read_string()
@@ -231,58 +632,472 @@ class BeatmapCache:
         self.audio_file = buffer.read_string()
         self.md5_hash = buffer.read_string()
         self.map_file = buffer.read_string()
-        self.ranked_status = buffer.read_ubyte()
-        self.num_hitcircles = buffer.read_ushort()
-        self.num_sliders = buffer.read_ushort()
-        self.num_spinners = buffer.read_ushort()
-        self.last_modified = buffer.read_date_time()
-        if version >= VersionChanges.FLOAT_DIFFICULTY_VALUES:
-            self.approach_rate = buffer.read_float()
-            self.circle_size = buffer.read_float()
-            self.hp_drain = buffer.read_float()
-            self.overall_difficulty = buffer.read_float()
-        else:
-            self.approach_rate = buffer.read_ubyte()
-            self.circle_size = buffer.read_ubyte()
-            self.hp_drain = buffer.read_ubyte()
-            self.overall_difficulty = buffer.read_ubyte()
-        self.slider_velocity = buffer.read_double()
+
+    @staticmethod
+    def _skip_metadata(buffer, version):
+        for _ in range(9 if version >= VersionChanges.FIRST_OSZ_2 else 7):
+            buffer.skip_string()
+
+    def _read_stats(self, buffer, version):
+        self.ranked_status, self.num_hitcircles, self.num_sliders, self.num_spinners, \
+            self.last_modified = buffer.read_struct(self.COUNTS)
+        self.approach_rate, self.circle_size, self.hp_drain, self.overall_difficulty, \
+            self.slider_velocity = buffer.read_struct(
+                self.FLOAT_DIFFICULTY if version >= VersionChanges.FLOAT_DIFFICULTY_VALUES else self.INT_DIFFICULTY)
+
+    @classmethod
+    def _skip_stats(cls, buffer, version):
+        buffer.skip(cls.COUNTS.size + (cls.FLOAT_DIFFICULTY.size if version >= VersionChanges.FLOAT_DIFFICULTY_VALUES
+                                       else cls.INT_DIFFICULTY.size))
+
+    def _read_star_ratings(self, buffer, version, star_ratings="dict"):
+        if version < VersionChanges.FLOAT_DIFFICULTY_VALUES:
+            return
+        if star_ratings == "skip":
+            self._skip_star_ratings(buffer, version)
+            self.diff_star_rating_standard = self.diff_star_rating_taiko = \
+                self.diff_star_rating_ctb = self.diff_star_rating_mania = None
+            return
+        as_array = star_ratings == "array"
+        self.diff_star_rating_standard = buffer.read_star_ratings(as_array)
+        self.diff_star_rating_taiko = buffer.read_star_ratings(as_array)
+        self.diff_star_rating_ctb = buffer.read_star_ratings(as_array)
+        self.diff_star_rating_mania = buffer.read_star_ratings(as_array)
+
+    @staticmethod
+    def _skip_star_ratings(buffer, version):
         if version >= VersionChanges.FLOAT_DIFFICULTY_VALUES:
-            self.diff_star_rating_standard = buffer.read_dictionary(Mods)
-            self.diff_star_rating_taiko = buffer.read_dictionary(Mods)
-            self.diff_star_rating_ctb = buffer.read_dictionary(Mods)
-            self.diff_star_rating_mania = buffer.read_dictionary(Mods)
-        self.drain_time = buffer.read_uint()
-        self.total_time = buffer.read_uint()
-        self.preview_time = buffer.read_uint()
-        self.timing_points = []
-        for _ in range(buffer.read_uint()):
-            self.timing_points.append(buffer.read_timing_point())
-        self.beatmap_id = buffer.read_uint()
-        self.beatmapset_id = buffer.read_uint()
-        self.thread_id = buffer.read_uint()
-        self.grade_standard = buffer.read_ubyte()
-        self.grade_taiko = buffer.read_ubyte()
-        self.grade_ctb = buffer.read_ubyte()
-        self.grade_mania = buffer.read_ubyte()
-        self.local_offset = buffer.read_short()
-        self.stack_leniency = buffer.read_float()
-        self.gameplay_mode = GameMode(buffer.read_ubyte())
+            for _ in range(4):
+                buffer.skip_dictionary()
+
+    def _read_timing(self, buffer, version):
+        self.drain_time, self.total_time, self.preview_time = buffer.read_struct(self.TIMES)
+        self.timing_points = buffer.read_timing_points(buffer.read_uint())
+
+    @classmethod
+    def _skip_timing(cls, buffer, version):
+        buffer.skip(cls.TIMES.size)
+        buffer.skip(Buffer.TIMING_POINT.size * buffer.read_uint())
+
+    def _read_ids(self, buffer, version):
+        self.beatmap_id, self.beatmapset_id, self.thread_id, self.grade_standard, self.grade_taiko, \
+            self.grade_ctb, self.grade_mania, self.local_offset, self.stack_leniency, \
+            gameplay_mode = buffer.read_struct(self.IDS)
+        self.gameplay_mode = GameMode(gameplay_mode)
+
+    @classmethod
+    def _skip_ids(cls, buffer, version):
+        buffer.skip(cls.IDS.size)
+
+    def _read_extra(self, buffer, version):
         self.song_source = buffer.read_string()
         self.song_tags = buffer.read_string()
         self.online_offset = buffer.read_short()
         self.font = buffer.read_string()
-        self.is_unplayed = buffer.read_bool()
-        self.last_played = buffer.read_date_time()
-        self.is_osz2 = buffer.read_bool()
+        self.is_unplayed, self.last_played, self.is_osz2 = buffer.read_struct(self.PLAY_STATE)
         self.folder_name = buffer.read_string()
-        self.last_check_against_osu_repo = buffer.read_date_time()
-        self.ignore_beatmap_sounds = buffer.read_bool()
-        self.ignore_beatmap_skin = buffer.read_bool()
-        self.disable_storyboard = buffer.read_bool()
-        self.disable_video = buffer.read_bool()
-        self.visual_override = buffer.read_bool()
+        self.last_check_against_osu_repo, self.ignore_beatmap_sounds, self.ignore_beatmap_skin, \
+            self.disable_storyboard, self.disable_video, self.visual_override = buffer.read_struct(self.OPTIONS)
         if version < VersionChanges.FLOAT_DIFFICULTY_VALUES:
             self.old_unknown1 = buffer.read_short()
-        self.last_edit_time = buffer.read_int()
-        self.mania_scroll_speed = buffer.read_ubyte()
+        self.last_edit_time, self.mania_scroll_speed = buffer.read_struct(self.LAST_EDIT)
+
+    @classmethod
+    def _skip_extra(cls, buffer, version):
+        buffer.skip_string()
+        buffer.skip_string()
+        buffer.skip(Buffer.SHORT.size)
+        buffer.skip_string()
+        buffer.skip(cls.PLAY_STATE.size)
+        buffer.skip_string()
+        buffer.skip(cls.OPTIONS.size)
+        if version < VersionChanges.FLOAT_DIFFICULTY_VALUES:
+            buffer.skip(Buffer.SHORT.size)
+        buffer.skip(cls.LAST_EDIT.size)
+
+
+def scan_record_offsets(buffer: Buffer, version, count) -> np.ndarray:
+    """
+    Skip-scans count osu!.db records from the buffer's offset and returns the offset
+    of each one, followed by the offset of the end of the last record.
+    """
+    offsets = np.empty(count + 1, dtype=np.int64)
+    for i in range(count):
+        offsets[i] = buffer.offset
+        BeatmapCache.skip(buffer, version)
+    offsets[count] = buffer.offset
+    return offsets
+
+
+def get_record_digests(view, offsets) -> np.ndarray:
+    """
+    Returns a 64 bit digest of the raw bytes of every record, given the offsets from
+    scan_record_offsets, so records can be compared without keeping their bytes.
+    """
+    return np.frombuffer(b"".join(
+        hashlib.blake2b(view[start:end], digest_size=8).digest() for start, end in zip(offsets[:-1], offsets[1:])
+    ), dtype=np.uint64)
+
+
+def _get_file_stat(path):
+    if path is None:
+        return None
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _decode_record_range(source, version, offset, count, groups, star_ratings, columns):
+    # Runs in the workers of OsuCache._decode_in_pool, source is a path or a shared view
+    buffer = Buffer.from_path(source) if isinstance(source, str) else Buffer(source)
+    buffer.offset = offset
+    if columns:
+        return OsuCacheColumns.decode(buffer, version, count)
+    return [BeatmapCache(buffer, version, groups, star_ratings) for _ in range(count)]
+
+
+class BeatmapCacheList:
+    """
+    Sequence of the BeatmapCache records of an osu!.db that only decodes a record
+    when it's accessed, using an index of record offsets built by skip-scanning.
+    """
+
+    __slots__ = ("buffer", "version", "groups", "star_ratings", "offsets", "_beatmaps")
+
+    def __init__(self, buffer: Buffer, version, count, groups=None, star_ratings="dict"):
+        self.buffer = buffer
+        self.version = version
+        self.groups = groups
+        self.star_ratings = star_ratings
+        self.offsets = scan_record_offsets(buffer, version, count)
+        self._beatmaps = [None] * count
+
+    def get(self, index, groups=None) -> BeatmapCache:
+        """
+        Decodes a record without caching it, optionally only the given groups. The shared
+        buffer isn't moved, so records can be decoded from several threads at once.
+        """
+        index = range(len(self))[index]
+        return BeatmapCache(self.buffer.at(int(self.offsets[index])), self.version, groups, self.star_ratings)
+
+    def get_raw(self, index) -> memoryview:
+        index = range(len(self))[index]
+        return self.buffer.view[self.offsets[index]:self.offsets[index+1]]
+
+    def __len__(self):
+        return len(self._beatmaps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = range(len(self))[index]
+        beatmap = self._beatmaps[index]
+        if beatmap is None:
+            beatmap = self._beatmaps[index] = self.get(index, self.groups)
+        return beatmap
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class StringTable:
+    """
+    Column of interned strings. Every distinct value is stored once in values and
+    codes holds the index into values for each row, so comparisons are done on codes.
+    """
+
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Sequence[Union[str, None]], codes: np.ndarray):
+        self.values = values
+        self.codes = codes
+
+    @classmethod
+    def concat(cls, tables: Sequence['StringTable']):
+        """Joins tables together, merging their values."""
+        lookup = {}
+        codes = []
+        for table in tables:
+            mapping = np.array([lookup.setdefault(value, len(lookup)) for value in table.values], dtype=np.int32)
+            codes.append(mapping[table.codes] if len(mapping) else table.codes)
+        return cls(list(lookup), np.concatenate(codes) if codes else np.zeros(0, dtype=np.int32))
+
+    @classmethod
+    def from_strings(cls, strings: Sequence[Union[str, None]]):
+        lookup = {}
+        codes = np.fromiter(
+            (lookup.setdefault(string, len(lookup)) for string in strings), dtype=np.int32, count=len(strings))
+        return cls(list(lookup), codes)
+
+    def equals(self, value) -> np.ndarray:
+        """Boolean mask of the rows equal to value."""
+        try:
+            return self.codes == self.values.index(value)
+        except ValueError:
+            return np.zeros(len(self.codes), dtype=bool)
+
+    def isin(self, values) -> np.ndarray:
+        """Boolean mask of the rows equal to any of values."""
+        values = set(values)
+        return np.isin(self.codes, [i for i, value in enumerate(self.values) if value in values])
+
+    def tolist(self):
+        values = self.values
+        return [values[code] for code in self.codes.tolist()]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self.values[self.codes[index]]
+        return StringTable(self.values, self.codes[index])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+
+class Columns:
+    """
+    Table of equal length columns (numpy arrays and StringTables), accessed as
+    attributes or by name.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+
+    @staticmethod
+    def _build(dtype, numeric, string_names, strings) -> dict:
+        records = np.array(numeric, dtype=dtype)
+        columns = {name: np.ascontiguousarray(records[name]) for name in dtype.names}
+        for name, values in zip(string_names, zip(*strings) if strings else [()] * len(string_names)):
+            columns[name] = StringTable.from_strings(values)
+        return columns
+
+    @classmethod
+    def concat(cls, parts: Sequence['Columns']):
+        """Joins tables with the same columns together, in order."""
+        return cls({
+            name: StringTable.concat([part[name] for part in parts]) if isinstance(column, StringTable)
+            else np.concatenate([part[name] for part in parts])
+            for name, column in parts[0].columns.items()
+        })
+
+    def filter(self, rows):
+        """Selects rows (a boolean mask or indexes) from every column."""
+        return type(self)({name: column[rows] for name, column in self.columns.items()})
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __getattr__(self, name):
+        if name == "columns" or name.startswith("__"):
+            raise AttributeError(name)
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'") from None
+
+
+class OsuCacheColumns(Columns):
+    """
+    Columnar form of the records of an osu!.db, in record order: a numpy array for
+    every numeric field and a StringTable for every text field. Star ratings and
+    timing points aren't included.
+    """
+
+    __slots__ = ()
+
+    # Numeric fields in the order they're stored in a record
+    RECORD_DTYPE = np.dtype([
+        ("ranked_status", "u1"), ("num_hitcircles", "<u2"), ("num_sliders", "<u2"), ("num_spinners", "<u2"),
+        ("last_modified", "<i8"), ("approach_rate", "<f4"), ("circle_size", "<f4"), ("hp_drain", "<f4"),
+        ("overall_difficulty", "<f4"), ("slider_velocity", "<f8"), ("drain_time", "<u4"), ("total_time", "<u4"),
+        ("preview_time", "<u4"), ("beatmap_id", "<u4"), ("beatmapset_id", "<u4"), ("thread_id", "<u4"),
+        ("grade_standard", "u1"), ("grade_taiko", "u1"), ("grade_ctb", "u1"), ("grade_mania", "u1"),
+        ("local_offset", "<i2"), ("stack_leniency", "<f4"), ("gameplay_mode", "u1"), ("online_offset", "<i2"),
+        ("is_unplayed", "?"), ("last_played", "<i8"), ("is_osz2", "?"), ("last_check_against_osu_repo", "<i8"),
+        ("ignore_beatmap_sounds", "?"), ("ignore_beatmap_skin", "?"), ("disable_storyboard", "?"),
+        ("disable_video", "?"), ("visual_override", "?"), ("last_edit_time", "<i4"), ("mania_scroll_speed", "u1"),
+    ])
+    STRING_COLUMNS = (
+        "artist", "artist_unicode", "title", "title_unicode", "mapper", "difficulty", "audio_file",
+        "md5_hash", "map_file", "song_source", "song_tags", "font", "folder_name"
+    )
+
+    @classmethod
+    def decode(cls, buffer: Buffer, version, count):
+        """Decodes count records starting at the buffer's offset straight into columns."""
+        numeric, strings = [], []
+        read_string = buffer.read_string
+        read_struct = buffer.read_struct
+        has_entry_length = VersionChanges.ENTRY_LENGTH_MIN <= version < VersionChanges.ENTRY_LENGTH_MAX
+        has_unicode = version >= VersionChanges.FIRST_OSZ_2
+        has_float_difficulty = version >= VersionChanges.FLOAT_DIFFICULTY_VALUES
+        difficulty_struct = BeatmapCache.FLOAT_DIFFICULTY if has_float_difficulty else BeatmapCache.INT_DIFFICULTY
+        for _ in range(count):
+            if has_entry_length:
+                buffer.skip(Buffer.UINT.size)
+            if has_unicode:
+                artist, artist_unicode, title, title_unicode = \
+                    read_string(), read_string(), read_string(), read_string()
+            else:
+                artist, title = read_string(), read_string()
+                artist_unicode = title_unicode = None
+            mapper, difficulty, audio_file, md5_hash, map_file = \
+                read_string(), read_string(), read_string(), read_string(), read_string()
+            counts = read_struct(BeatmapCache.COUNTS)
+            difficulty_values = read_struct(difficulty_struct)
+            BeatmapCache._skip_star_ratings(buffer, version)
+            times = read_struct(BeatmapCache.TIMES)
+            buffer.skip(Buffer.TIMING_POINT.size * buffer.read_uint())
+            ids = read_struct(BeatmapCache.IDS)
+            song_source, song_tags = read_string(), read_string()
+            online_offset = buffer.read_short()
+            font = read_string()
+            play_state = read_struct(BeatmapCache.PLAY_STATE)
+            folder_name = read_string()
+            options = read_struct(BeatmapCache.OPTIONS)
+            if not has_float_difficulty:
+                buffer.skip(Buffer.SHORT.size)
+            last_edit = read_struct(BeatmapCache.LAST_EDIT)
+
+            numeric.append(counts + difficulty_values + times + ids + (online_offset,) + play_state +
+                           options + last_edit)
+            strings.append((artist, artist_unicode, title, title_unicode, mapper, difficulty, audio_file,
+                            md5_hash, map_file, song_source, song_tags, font, folder_name))
+
+        return cls(cls._build(cls.RECORD_DTYPE, numeric, cls.STRING_COLUMNS, strings))
+
+
+Score = namedtuple("Score", (
+    "gameplay_mode", "version", "beatmap_hash", "player", "replay_hash", "num_300", "num_100", "num_50",
+    "num_geki", "num_katu", "num_miss", "score", "max_combo", "perfect", "mods", "timestamp",
+    "online_score_id", "additional_mod_info"
+))
+
+
+class ScoreColumns(Columns):
+    """Columnar form of the scores of a scores.db, see ScoresDb.to_columns."""
+
+    __slots__ = ()
+
+    RECORD_DTYPE = np.dtype([
+        ("gameplay_mode", "u1"), ("version", "<i4"), ("num_300", "<u2"), ("num_100", "<u2"), ("num_50", "<u2"),
+        ("num_geki", "<u2"), ("num_katu", "<u2"), ("num_miss", "<u2"), ("score", "<i4"), ("max_combo", "<u2"),
+        ("perfect", "?"), ("mods", "<i4"), ("timestamp", "<i8"), ("online_score_id", "<i8"),
+        ("additional_mod_info", "<f8"),
+    ])
+    STRING_COLUMNS = ("beatmap_hash", "player", "replay_hash")
+
+
+class ScoresDb:
+    """
+    Streaming reader for scores.db. Nothing is decoded up front: scores are read as
+    they're iterated over, grouped by beatmap hash, and the scores of beatmaps left
+    out by a hash filter are skipped over without being decoded.
+    """
+
+    __slots__ = ("buffer", "version", "beatmap_count", "_records_offset")
+
+    SCORE_HEADER = struct.Struct("<Bi")
+    SCORE_STATS = struct.Struct("<6HiH?i")
+    # Mods bit for target practice, which stores an extra double at the end of a score
+    TARGET_PRACTICE = 1 << 23
+
+    def __init__(self, buffer: Union[IO, Buffer]):
+        if not isinstance(buffer, Buffer):
+            buffer = Buffer(buffer)
+
+        self.buffer = buffer
+        self.version = buffer.read_int()
+        self.beatmap_count = buffer.read_int()
+        self._records_offset = buffer.offset
+
+    @classmethod
+    def from_path(cls, path: str):
+        return cls(Buffer.from_path(path))
+
+    def _iter_groups(self, hashes):
+        # Every iteration gets its own offset so generators can be used side by side
+        buffer = self.buffer.at(self._records_offset)
+        for _ in range(self.beatmap_count):
+            beatmap_hash = buffer.read_string()
+            count = buffer.read_int()
+            if hashes is not None and beatmap_hash not in hashes:
+                for _ in range(count):
+                    self._skip_score(buffer)
+                continue
+            yield beatmap_hash, count, buffer
+
+    def iter_beatmaps(self, hashes: Iterable[str] = None):
+        """
+        Yields a (beatmap hash, list of Score) pair for every beatmap in the database,
+        or only for the beatmaps in hashes if it's given.
+        """
+        hashes = set(hashes) if hashes is not None else None
+        for beatmap_hash, count, buffer in self._iter_groups(hashes):
+            yield beatmap_hash, [self._read_score(buffer) for _ in range(count)]
+
+    def iter_scores(self, hashes: Iterable[str] = None):
+        """Yields every Score, or only those of the beatmaps in hashes if it's given."""
+        for _, scores in self.iter_beatmaps(hashes):
+            yield from scores
+
+    def to_columns(self, hashes: Iterable[str] = None) -> ScoreColumns:
+        """
+        Decodes the scores straight into a ScoreColumns. gameplay_mode and mods are left
+        as ints and additional_mod_info is nan for scores without target practice.
+        """
+        hashes = set(hashes) if hashes is not None else None
+        numeric, strings = [], []
+        for _, count, buffer in self._iter_groups(hashes):
+            for _ in range(count):
+                values, score_strings = self._read_score_values(buffer)
+                numeric.append(values)
+                strings.append(score_strings)
+        return ScoreColumns(Columns._build(ScoreColumns.RECORD_DTYPE, numeric, ScoreColumns.STRING_COLUMNS, strings))
+
+    @classmethod
+    def _read_score_values(cls, buffer):
+        gameplay_mode, version = buffer.read_struct(cls.SCORE_HEADER)
+        strings = (buffer.read_string(), buffer.read_string(), buffer.read_string())
+        stats = buffer.read_struct(cls.SCORE_STATS)
+        # Life bar graph, which is always empty
+        buffer.skip_string()
+        timestamp = buffer.read_date_time()
+        buffer.skip(Buffer.INT.size)
+        online_score_id = buffer.read_long() if version >= VersionChanges.REPLAY_SCORE_ID_64BIT else buffer.read_int()
+        additional_mod_info = buffer.read_double() if stats[-1] & cls.TARGET_PRACTICE else float("nan")
+        return (gameplay_mode, version, *stats, timestamp, online_score_id, additional_mod_info), strings
+
+    @classmethod
+    def _read_score(cls, buffer) -> Score:
+        (gameplay_mode, version, *stats, timestamp, online_score_id, additional_mod_info), strings = \
+            cls._read_score_values(buffer)
+        stats[-1] = get_mods(stats[-1])
+        if additional_mod_info != additional_mod_info:
+            additional_mod_info = None
+        return Score(GameMode(gameplay_mode), version, *strings, *stats, timestamp, online_score_id,
+                     additional_mod_info)
+
+    @classmethod
+    def _skip_score(cls, buffer):
+        _, version = buffer.read_struct(cls.SCORE_HEADER)
+        for _ in range(3):
+            buffer.skip_string()
+        buffer.skip(cls.SCORE_STATS.size - Buffer.INT.size)
+        mods = buffer.read_int()
+        buffer.skip_string()
+        buffer.skip(Buffer.LONG.size + Buffer.INT.size)
+        buffer.skip(Buffer.LONG.size if version >= VersionChanges.REPLAY_SCORE_ID_64BIT else Buffer.INT.size)
+        if mods & cls.TARGET_PRACTICE:
+            buffer.skip(Buffer.DOUBLE.size)
+
+    def __iter__(self):
+        return self.iter_beatmaps()
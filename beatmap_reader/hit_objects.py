@@ -3,6 +3,11 @@ from .path import Vector2, SliderPath
 from .util import difficulty_range, clamp
 from numpy import arange
 from collections import namedtuple
+import numpy as np
+
+
+class HitObjectError(ValueError):
+    """Raised when a hit object can't be created from its line of the beatmap."""
 
 
 def get_hit_object(parent, data, index):
@@ -31,6 +36,164 @@ def get_hit_object(parent, data, index):
         raise ValueError("Hit object does not have a valid type specified.")
 
 
+def get_hit_object_types(type_bits):
+    # Same precedence as get_hit_object
+    is_circle = (type_bits & (1 << 0)) != 0
+    is_slider = (type_bits & (1 << 1)) != 0
+    is_spinner = (type_bits & (1 << 3)) != 0
+    is_hold_key = (type_bits & (1 << 7)) != 0
+    if not np.all(is_circle | is_slider | is_spinner | is_hold_key):
+        raise ValueError("Hit object does not have a valid type specified.")
+    return np.select(
+        [is_circle, is_slider, is_spinner],
+        [HitObjectType.HITCIRCLE, HitObjectType.SLIDER, HitObjectType.SPINNER],
+        HitObjectType.MANIA_HOLD_KEY
+    ).astype(np.int8)
+
+
+class HitObjectColumns:
+    """
+    Columnar representation of a beatmap's hit objects, parsed straight from the
+    [HitObjects] lines. Every attribute is an array with one entry per hit object,
+    ordered by time (the same order as HitObjectList).
+
+    The hit objects of a HitObjectList are separate objects filled in from the same
+    lines, not views of these arrays. Beatmap keeps stack_height, stacked_x and
+    stacked_y in step with them.
+    """
+
+    __slots__ = (
+        "index", "x", "y", "time", "end_time", "type", "new_combo",
+        "combo_colour_skip", "hit_sound", "stack_height", "stacked_x", "stacked_y",
+        "ui_timing_point_index", "i_timing_point_index"
+    )
+
+    def __init__(self, parent, lines):
+        fields = [line.split(",", 8) for line in lines]
+        time = np.array([int(data[2]) for data in fields], dtype=np.int32)
+        type_bits = np.array([int(data[3]) for data in fields], dtype=np.int32)
+        types = get_hit_object_types(type_bits)
+
+        end_time = time.astype(np.float64)
+        for i in np.flatnonzero(types == HitObjectType.SPINNER):
+            end_time[i] = int(fields[i][5])
+        for i in np.flatnonzero(types == HitObjectType.MANIA_HOLD_KEY):
+            end_time[i] = int(fields[i][5].split(":")[0])
+        if len(fields) > 0:
+            ui_indexes, i_indexes = parent.timing_points.resolve(time)
+        else:
+            ui_indexes = i_indexes = np.zeros(0, dtype=np.int64)
+        sliders = np.flatnonzero(types == HitObjectType.SLIDER)
+        if len(sliders) > 0:
+            end_time[sliders] = self._calculate_slider_end_times(
+                parent, time[sliders],
+                np.array([int(fields[i][6]) for i in sliders], dtype=np.float64),
+                np.array([float(fields[i][7]) for i in sliders], dtype=np.float64),
+                ui_indexes[sliders], i_indexes[sliders]
+            )
+
+        order = np.argsort(time, kind="stable")
+        self.index = order
+        self.x = np.array([float(data[0]) for data in fields], dtype=np.float64)[order]
+        self.y = np.array([float(data[1]) for data in fields], dtype=np.float64)[order]
+        self.time = time[order]
+        self.ui_timing_point_index = ui_indexes[order].astype(np.int32)
+        self.i_timing_point_index = i_indexes[order].astype(np.int32)
+        self.end_time = end_time[order]
+        self.type = types[order]
+        type_bits = type_bits[order]
+        self.new_combo = (type_bits & (1 << 2)) != 0
+        self.combo_colour_skip = np.where(self.new_combo, type_bits & 0b01110000, 0).astype(np.uint8)
+        self.hit_sound = np.array([int(data[4]) if data[4] else 0 for data in fields], dtype=np.uint8)[order]
+        self.stack_height = np.zeros(len(fields), dtype=np.int32)
+        self.stacked_x = self.x.copy()
+        self.stacked_y = self.y.copy()
+
+    def set_stack_heights(self, stack_heights, scale):
+        """Sets stack_height and offsets stacked_x and stacked_y by it, the same as HitObjectBase."""
+        self.stack_height[:] = stack_heights
+        stack_offset = self.stack_height * scale * -6.4
+        self.stacked_x = self.x + stack_offset
+        self.stacked_y = self.y + stack_offset
+
+    @staticmethod
+    def _calculate_slider_end_times(parent, time, slides, length, ui_indexes, i_indexes):
+        # Vectorized version of Slider.calculate_time_attributes
+        if np.any(ui_indexes < 0):
+            raise ValueError("A slider has no uninherited timing point to take its beat length from, "
+                             "the beatmap doesn't have any.")
+        timing_points = parent.timing_points
+        scoring_distance = HitObjectBase.BASE_SCORING_DISTANCE * parent.difficulty.slider_multiplier * \
+            np.where(i_indexes >= 0, timing_points.slider_velocity[i_indexes], 1)
+        velocity = scoring_distance / timing_points.beat_length[ui_indexes]
+        return time + slides * length / velocity
+
+    def __len__(self):
+        return len(self.time)
+
+
+class HitObjectList:
+    """
+    Sequence of hit objects backed by the raw [HitObjects] lines and their
+    HitObjectColumns. The full objects are created (and have their timing points
+    assigned) the first time they're accessed.
+
+    The columns only parse the fields every hit object has, so anything else that's
+    malformed (e.g. slider curves) is found when the object is created. That raises
+    a HitObjectError from the access instead of making Beatmap.load return False.
+    """
+
+    __slots__ = ("parent", "lines", "columns", "_objects")
+
+    def __init__(self, parent, lines):
+        self.parent = parent
+        self.lines = lines
+        self.columns = HitObjectColumns(parent, lines)
+        self._objects = [None] * len(lines)
+
+    def _create(self, i):
+        index = int(self.columns.index[i])
+        try:
+            hit_object = get_hit_object(self.parent, self.lines[index], index)
+            self._set_timing_point(hit_object, i)
+            if hit_object.type == HitObjectType.SLIDER:
+                hit_object.calculate_time_attributes()
+        except Exception as e:
+            raise HitObjectError(f"Could not create hit object {index} of {self.parent.path}: {e}") from e
+        self._objects[i] = hit_object
+        return hit_object
+
+    def _set_timing_point(self, hit_object, i):
+        timing_points = self.parent.timing_points
+        ui_index = self.columns.ui_timing_point_index[i]
+        i_index = self.columns.i_timing_point_index[i]
+        hit_object.ui_timing_point = timing_points[int(ui_index)] if ui_index != -1 else None
+        if i_index != -1:
+            hit_object.i_timing_point = timing_points[int(i_index)]
+
+    def count(self, hit_object_type):
+        return int(np.count_nonzero(self.columns.type == hit_object_type))
+
+    def loaded(self):
+        """Iterates over the hit objects that have been created so far."""
+        return filter(lambda obj: obj is not None, self._objects)
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        hit_object = self._objects[index]
+        if hit_object is None:
+            hit_object = self._create(range(len(self))[index])
+        return hit_object
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
 class HitObjectBase:
     OBJECT_RADIUS = 64
     PREEMPT_MIN = 450
@@ -55,7 +218,7 @@ class HitObjectBase:
         self.i_timing_point = None
         self.time_preempt = difficulty_range(parent.difficulty.approach_rate, 1800, 1200, self.PREEMPT_MIN)
         self.time_fade_in = 400 * min(1, self.time_preempt / self.PREEMPT_MIN)
-        self.scale = (1.0 - 0.7 * (parent.difficulty.circle_size - 5) / 5) / 2
+        self.scale = self.get_scale(parent.difficulty.circle_size)
         self.radius = self.OBJECT_RADIUS * self.scale
         self.stack_height = None
         self.stack_offset = None
@@ -67,10 +230,14 @@ class HitObjectBase:
         # Recalculate attributes that are based on a map's difficulty values
         self.time_preempt = difficulty_range(self.parent.difficulty.approach_rate, 1800, 1200, self.PREEMPT_MIN)
         self.time_fade_in = 400 * min(1, self.time_preempt / self.PREEMPT_MIN)
-        self.scale = (1.0 - 0.7 * (self.parent.difficulty.circle_size - 5) / 5) / 2
+        self.scale = self.get_scale(self.parent.difficulty.circle_size)
         self.radius = self.OBJECT_RADIUS * self.scale
         self._set_stack_height(self.stack_height)
 
+    @staticmethod
+    def get_scale(circle_size):
+        return (1.0 - 0.7 * (circle_size - 5) / 5) / 2
+
     def _set_stack_height(self, stack_height):
         super().__setattr__("stack_height", stack_height)
         self.stack_offset = stack_height * self.scale * -6.4
@@ -140,8 +307,12 @@ class Slider(HitObjectBase):
         self.end_time = self.time + self.slides * self.length / self.velocity
         self.span_duration = (self.end_time - self.time) / self.slides
 
-    def calculate_path(self):
-        self.path.calculate()
+    def calculate_path(self, cache=None, precision=None):
+        """Uses the beatmap's path_precision if precision isn't given."""
+        self.path.calculate(cache, self.parent.path_precision if precision is None else precision)
+        self.on_path_calculated()
+
+    def on_path_calculated(self):
         self.end_position = self.position_at_path_progress(1)
         if self.stack_offset:
             self.stacked_end_position = self.end_position + self.stack_offset
@@ -153,26 +324,28 @@ class Slider(HitObjectBase):
         self.nested_objects = []
         events = SliderEventGenerator.generate(self.time, self.span_duration, self.velocity, self.tick_distance,
                                                self.path.calculated_distance, self.slides, self.LEGACY_LAST_TICK_OFFSET)
+        # Every position along the path is sampled in one go
+        positions = self.path.positions_at([event.path_progress for event in events]).tolist()
 
-        for event in events:
+        for event, (x, y) in zip(events, positions):
             if event.type == SliderEventType.TICK:
-                position = self.position_at_path_progress(event.path_progress, stacked=False)
+                position = Vector2(x, y)
                 self.nested_objects.append(SliderObject(position, position+self.stack_offset, event.time,
                                                         SliderEventType.TICK))
             elif event.type == SliderEventType.HEAD:
                 self.nested_objects.append(SliderObject(self.position, self.stacked_position, event.time,
                                                         SliderEventType.HEAD))
             elif event.type == SliderEventType.LEGACY_LAST_TICK:
-                pos = self.position_at_path_progress(event.path_progress)
+                pos = Vector2(x, y) + self.stack_offset
                 self.nested_objects.append(SliderObject(pos, pos+self.stack_offset, event.time,
                                                         SliderEventType.LEGACY_LAST_TICK))
             elif event.type == SliderEventType.REPEAT:
-                position = self.position_at_path_progress(event.path_progress, stacked=False)
+                position = Vector2(x, y)
                 self.nested_objects.append(SliderObject(position, position+self.stack_offset,
                                                         self.time + (event.span_index + 1) * self.span_duration,
                                                         SliderEventType.REPEAT))
             elif event.type == SliderEventType.TAIL:
-                position = self.position_at_path_progress(event.path_progress, stacked=False)
+                position = Vector2(x, y)
                 self.tail_circle = SliderObject(position, position+self.stack_offset, event.time,
                                                 SliderEventType.TAIL)
 
@@ -197,6 +370,27 @@ class Slider(HitObjectBase):
             return self.position_at_slider_progress(1, stacked)
         return self.position_at_slider_progress((offset - self.time) / (self.end_time - self.time), stacked)
 
+    def curve_progresses_at(self, progress):
+        progress = np.asarray(progress, dtype=np.float64) * self.slides
+        curve_progress = progress % 1
+        return np.where((progress // 1) % 2 == 1, 1 - curve_progress, curve_progress)
+
+    def positions_at_path_progress(self, progress, stacked=True):
+        """Array version of position_at_path_progress, returning an (N, 2) array for N progress values."""
+        positions = self.path.positions_at(progress)
+        if stacked:
+            positions += self.stack_offset
+        return positions
+
+    def positions_at_slider_progress(self, progress, stacked=True):
+        return self.positions_at_path_progress(self.curve_progresses_at(progress), stacked)
+
+    def positions_at_offset(self, offset, stacked=True):
+        offset = np.asarray(offset, dtype=np.float64)
+        if self.time == self.end_time:  # edge case
+            return self.positions_at_slider_progress(np.ones_like(offset), stacked)
+        return self.positions_at_slider_progress((offset - self.time) / (self.end_time - self.time), stacked)
+
 
 class Spinner(HitObjectBase):
     type = HitObjectType.SPINNER
@@ -0,0 +1,94 @@
+import json
+import os
+
+
+class ManifestEntry:
+    __slots__ = ("size", "mtime", "md5_hash", "header", "stats")
+
+    def __init__(self, size, mtime, md5_hash, header, stats):
+        self.size = size
+        self.mtime = mtime
+        self.md5_hash = md5_hash
+        self.header = header
+        self.stats = stats
+
+    def to_json(self):
+        return [self.size, self.mtime, self.md5_hash, self.header, self.stats]
+
+
+class LibraryManifest:
+    """
+    On-disk record of every .osu file in a songs folder, keyed by the path relative
+    to the folder. Each entry stores the file's size, mtime (in nanoseconds) and md5
+    hash along with its tokenized header sections and object stats (None if it was
+    scanned with stage "header"), so unchanged files don't need to be read again on
+    the next scan.
+    """
+
+    __slots__ = ("path", "root", "entries")
+    VERSION = 1
+
+    def __init__(self, path, root):
+        self.path = path
+        self.root = root
+        self.entries = {}
+
+    @classmethod
+    def from_path(cls, path, root):
+        manifest = cls(path, root)
+        if not os.path.isfile(path):
+            return manifest
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        # Anything from another version or songs folder is just rebuilt
+        if data.get("version") != cls.VERSION or data.get("root") != os.path.abspath(root):
+            return manifest
+        manifest.entries = {
+            key: ManifestEntry(*entry) for key, entry in data["entries"].items()
+        }
+        return manifest
+
+    def _key(self, path):
+        return os.path.relpath(path, self.root)
+
+    def get(self, path, size, mtime, need_stats=False, get_hash=None):
+        """
+        Returns the entry for path if the file hasn't changed since it was recorded.
+        If only the mtime changed, get_hash(path) is compared with the recorded md5
+        hash instead, and a matching entry takes the new mtime.
+        """
+        entry = self.entries.get(self._key(path))
+        if entry is None or entry.size != size:
+            return
+        if need_stats and entry.stats is None:
+            return
+        if entry.mtime != mtime:
+            if get_hash is None or entry.md5_hash is None or get_hash(path) != entry.md5_hash:
+                return
+            entry.mtime = mtime
+        return entry
+
+    def update(self, path, size, mtime, md5_hash, header, stats):
+        self.entries[self._key(path)] = ManifestEntry(size, mtime, md5_hash, header, stats)
+
+    def prune(self, paths):
+        """Drops the entries of any file that isn't in paths."""
+        keys = set(map(self._key, paths))
+        for key in list(self.entries):
+            if key not in keys:
+                del self.entries[key]
+
+    def save(self):
+        data = {
+            "version": self.VERSION,
+            "root": os.path.abspath(self.root),
+            "entries": {key: entry.to_json() for key, entry in self.entries.items()}
+        }
+        # Write to a temporary file first so an interrupted save doesn't corrupt the manifest
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self):
+        return len(self.entries)
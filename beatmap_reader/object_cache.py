@@ -0,0 +1,205 @@
+from .enums import HitObjectType, SliderEventType
+from .hit_objects import HitObjectBase, SliderObject
+from .path import DEFAULT_PRECISION, Vector2, get_precision
+import numpy as np
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+
+
+class ObjectCache:
+    """
+    Directory of binary files holding the computed state of fully loaded beatmaps
+    (slider paths, stack heights and nested objects), keyed by the md5 hash of the
+    .osu file, the beatmap's path_precision and, if mods changed them, the approach
+    rate and circle size that stacking was done with. Restoring a beatmap maps the file into
+    memory and uses the arrays in place instead of computing everything again.
+
+    File layout (little endian): the MAGIC bytes, a header struct, then each array
+    back to back, every one starting on an 8 byte boundary.
+    """
+
+    MAGIC = b"BRCO"
+    VERSION = 1
+    HEADER = struct.Struct("<4sI7q")
+    EXTENSION = ".brc"
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_hash(path):
+        with open(path, "rb") as f:
+            return hashlib.md5(f.read()).hexdigest()
+
+    def get_cache_path(self, md5_hash, precision=DEFAULT_PRECISION, difficulty=None):
+        """difficulty is the modded (approach_rate, circle_size) from get_difficulty_key, if any."""
+        precision = get_precision(precision)
+        if precision != DEFAULT_PRECISION:
+            md5_hash += "-" + "-".join(map(str, precision))
+        if difficulty is not None:
+            md5_hash += "-ar{}-cs{}".format(*map(float, difficulty))
+        return os.path.join(self.directory, md5_hash + self.EXTENSION)
+
+    @staticmethod
+    def get_difficulty_key(beatmap):
+        """
+        Returns the approach rate and circle size of a beatmap that has mods applied,
+        since stacking depends on them, or None if it has none.
+        """
+        if not beatmap.difficulty.is_modded():
+            return None
+        return beatmap.difficulty.approach_rate, beatmap.difficulty.circle_size
+
+    def _get_beatmap_cache_path(self, beatmap, md5_hash):
+        return self.get_cache_path(md5_hash or self.get_hash(beatmap.path), beatmap.path_precision,
+                                   self.get_difficulty_key(beatmap))
+
+    def save(self, beatmap, md5_hash=None):
+        """
+        Writes the computed state of a beatmap that has had load_objects called on it.
+        The file is written under a temporary name and then moved into place, so other
+        processes never see it half written. Raises a ValueError if mods were applied
+        after stacking, since the stack heights wouldn't match a fresh load with them.
+        """
+        difficulty = beatmap.difficulty
+        if beatmap.stacking_difficulty != (difficulty.approach_rate, difficulty.circle_size):
+            raise ValueError("Mods were applied after stacking, load the objects again before saving them")
+        hit_objects = list(beatmap.hit_objects)
+        sliders = [obj for obj in hit_objects if obj.type == HitObjectType.SLIDER]
+
+        paths = [np.asarray(slider.path.calculated_path, dtype=np.float64).reshape(-1, 2) for slider in sliders]
+        distances = [np.asarray(slider.path.cumulative_distance, dtype=np.float64) for slider in sliders]
+        segment_ends = [np.asarray(slider.path.segmentEnds, dtype=np.float64) for slider in sliders]
+        nested = [slider.nested_objects for slider in sliders]
+
+        arrays = [
+            np.array([obj.stack_height for obj in hit_objects], dtype=np.int64),
+            self._offsets(paths), self._concat(paths, (0, 2)),
+            self._offsets(distances), self._concat(distances, (0,)),
+            self._offsets(segment_ends), self._concat(segment_ends, (0,)),
+            self._offsets(nested),
+            np.array([(*obj.position, *obj.stacked_position, obj.time)
+                      for objects in nested for obj in objects], dtype=np.float64).reshape(-1, 5),
+            np.array([obj.type for objects in nested for obj in objects], dtype=np.int64),
+            np.array([(*slider.tail_circle.position, *slider.tail_circle.stacked_position, slider.tail_circle.time)
+                      for slider in sliders], dtype=np.float64).reshape(-1, 5),
+        ]
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, len(hit_objects), len(sliders),
+            len(arrays[2]), len(arrays[4]), len(arrays[6]), len(arrays[9]), beatmap.max_combo
+        )
+
+        cache_path = self._get_beatmap_cache_path(beatmap, md5_hash)
+        f = tempfile.NamedTemporaryFile("wb", dir=self.directory, suffix=".tmp", delete=False)
+        try:
+            with f:
+                f.write(header)
+                for array in arrays:
+                    f.write(b"\0" * (-f.tell() % 8))
+                    f.write(np.ascontiguousarray(array).tobytes())
+            os.replace(f.name, cache_path)
+        except BaseException:
+            self._discard(f.name)
+            raise
+
+    def restore(self, beatmap, md5_hash=None):
+        """
+        Fills in the computed state of a beatmap that has been loaded with Beatmap.load,
+        in place of Beatmap.load_objects. Returns False if the beatmap isn't cached.
+        Empty or truncated cache files are deleted. Apply mods before restoring, the
+        state saved for the beatmap's current approach rate and circle size is used.
+        """
+        path = self._get_beatmap_cache_path(beatmap, md5_hash)
+        if not os.path.isfile(path):
+            return False
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < self.HEADER.size:
+                buf = None
+            else:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if buf is None:
+            self._discard(path)
+            return False
+
+        magic, version, object_count, slider_count, path_count, distance_count, segment_end_count, \
+            nested_count, max_combo = self.HEADER.unpack_from(buf)
+        if magic != self.MAGIC or version != self.VERSION:
+            return False
+        hit_objects = list(beatmap.hit_objects)
+        sliders = [obj for obj in hit_objects if obj.type == HitObjectType.SLIDER]
+        if object_count != len(hit_objects) or slider_count != len(sliders):
+            return False
+
+        layout = [
+            (np.int64, (object_count,)), (np.int64, (slider_count + 1,)), (np.float64, (path_count, 2)),
+            (np.int64, (slider_count + 1,)), (np.float64, (distance_count,)),
+            (np.int64, (slider_count + 1,)), (np.float64, (segment_end_count,)),
+            (np.int64, (slider_count + 1,)), (np.float64, (nested_count, 5)), (np.int64, (nested_count,)),
+            (np.float64, (slider_count, 5)),
+        ]
+        size = self.HEADER.size
+        for dtype, shape in layout:
+            size += -size % 8 + np.dtype(dtype).itemsize * int(np.prod(shape))
+        if min(path_count, distance_count, segment_end_count, nested_count) < 0 or size != len(buf):
+            buf.close()
+            self._discard(path)
+            return False
+
+        offset = self.HEADER.size
+
+        def read(dtype, shape):
+            nonlocal offset
+            offset += -offset % 8
+            array = np.frombuffer(buf, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+            offset += array.nbytes
+            return array
+
+        stack_heights, path_offsets, calculated_paths, distance_offsets, distances, segment_end_offsets, \
+            segment_ends, nested_offsets, nested_values, nested_types, tails = \
+            [read(dtype, shape) for dtype, shape in layout]
+
+        # Same order as Beatmap.load_objects: paths, then stacking, then nested objects
+        for i, slider in enumerate(sliders):
+            slider.path.calculated_path = calculated_paths[path_offsets[i]:path_offsets[i+1]]
+            slider.path.cumulative_distance = distances[distance_offsets[i]:distance_offsets[i+1]]
+            slider.path.segmentEnds = segment_ends[segment_end_offsets[i]:segment_end_offsets[i+1]]
+            slider.path.calculated = True
+            slider.end_position = slider.position_at_path_progress(1)
+        for hit_object, stack_height in zip(hit_objects, stack_heights.tolist()):
+            hit_object.stack_height = stack_height
+        beatmap.hit_objects.columns.set_stack_heights(stack_heights,
+                                                      HitObjectBase.get_scale(beatmap.difficulty.circle_size))
+        beatmap.stacking_difficulty = (beatmap.difficulty.approach_rate, beatmap.difficulty.circle_size)
+        for i, slider in enumerate(sliders):
+            slider.nested_objects = [
+                self._slider_object(values, SliderEventType(event_type))
+                for values, event_type in zip(nested_values[nested_offsets[i]:nested_offsets[i+1]].tolist(),
+                                              nested_types[nested_offsets[i]:nested_offsets[i+1]].tolist())
+            ]
+            slider.tail_circle = self._slider_object(tails[i].tolist(), SliderEventType.TAIL)
+        beatmap.max_combo = max_combo
+        return True
+
+    @staticmethod
+    def _discard(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _slider_object(values, event_type):
+        x, y, stacked_x, stacked_y, time = values
+        return SliderObject(Vector2(x, y), Vector2(stacked_x, stacked_y), time, event_type)
+
+    @staticmethod
+    def _offsets(arrays):
+        return np.concatenate([[0], np.cumsum([len(array) for array in arrays], dtype=np.int64)]).astype(np.int64)
+
+    @staticmethod
+    def _concat(arrays, empty_shape):
+        return np.concatenate(arrays) if arrays else np.zeros(empty_shape, dtype=np.float64)
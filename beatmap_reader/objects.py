@@ -1,8 +1,12 @@
 from .read import SongsReader, BeatmapsetReader, BeatmapReader
+from .manifest import LibraryManifest
+from .object_cache import ObjectCache
+from .path import SliderPathCache, calculate_paths, get_precision, global_path_cache
 from .util import search_for_songs_folder, get_sample_set
 from .enums import *
 from .hit_objects import (
-    get_hit_object,
+    HitObjectList,
+    HitObjectColumns,
     HitObjectBase,
     HitCircle,
     Slider,
@@ -10,6 +14,10 @@ from .hit_objects import (
     ManiaHoldKey
 )
 from typing import Sequence, Union
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import numpy as np
+import hashlib
 import os
 import traceback
 
@@ -107,6 +115,10 @@ class Difficulty:
         self.overall_difficulty = self._overall_difficulty
         self.approach_rate = self._approach_rate
 
+    def is_modded(self):
+        return (self.hp_drain_rate, self.circle_size, self.overall_difficulty, self.approach_rate) != \
+            (self._hp_drain_rate, self._circle_size, self._overall_difficulty, self._approach_rate)
+
     def apply_mods(self, mods: Mods):
         if Mods.HardRock in mods:
             self.hp_drain_rate = min(self._hp_drain_rate * 1.4, 10)
@@ -165,21 +177,108 @@ class InheritedTimingPoint:
 
 class TimingPoint:
     def __new__(cls, string) -> Union[InheritedTimingPoint, UninheritedTimingPoint]:
-        data = string.split(",")
-        time = float(data[0])
-        beat_length = float(data[1])
-        # TODO: find some default values for these I guess
-        meter = int(data[2]) if len(data) > 2 else None
-        sample_set = get_sample_set(data[3]) if len(data) > 3 else None
-        sample_index = int(data[4]) if len(data) > 4 else None
-        volume = int(data[5]) if len(data) > 5 else None
-        uninherited = bool(int(data[6])) if len(data) > 6 else None
-        effects = int(data[7]) if len(data) > 7 else None
-        if uninherited or uninherited is None:
-            return UninheritedTimingPoint(time, beat_length, meter, sample_set,
-                                          sample_index, volume, effects)
-        return InheritedTimingPoint(time, beat_length, sample_set, sample_index,
-                                    volume, effects)
+        # Parsed the same way as a line of a beatmap's timing points
+        return TimingPointList([string])[0]
+
+
+class TimingPointList:
+    """
+    Sequence of timing points, sorted by time and stored as arrays. The
+    InheritedTimingPoint/UninheritedTimingPoint objects are only created when accessed.
+    Missing optional values are stored as -1.
+    """
+
+    __slots__ = (
+        "time", "beat_length", "meter", "sample_set", "sample_index", "volume",
+        "uninherited", "effects", "parent_index", "slider_velocity", "_timing_points"
+    )
+
+    def __init__(self, lines: Sequence[str]):
+        rows = [line.split(",") for line in lines]
+        order = np.argsort([float(row[0]) for row in rows], kind="stable")
+        rows = [rows[i] for i in order]
+        self.time = np.array([float(row[0]) for row in rows], dtype=np.float64)
+        self.beat_length = np.array([float(row[1]) for row in rows], dtype=np.float64)
+        self.meter = self._optional_column(rows, 2)
+        self.sample_set = [get_sample_set(row[3]) if len(row) > 3 else None for row in rows]
+        self.sample_index = self._optional_column(rows, 4)
+        self.volume = self._optional_column(rows, 5)
+        self.uninherited = self._optional_column(rows, 6) != 0
+        self.effects = self._optional_column(rows, 7)
+
+        # Index of the latest uninherited timing point at or before each timing point
+        indexes = np.arange(len(rows))
+        self.parent_index = np.maximum.accumulate(np.where(self.uninherited, indexes, -1)) \
+            if len(rows) > 0 else indexes
+        with np.errstate(divide="ignore"):
+            self.slider_velocity = np.where(self.uninherited, 1, 1 / (-self.beat_length / 100))
+        self._timing_points = [None] * len(rows)
+
+    @staticmethod
+    def _optional_column(rows, index):
+        return np.array([int(row[index]) if len(row) > index else -1 for row in rows], dtype=np.int64)
+
+    def resolve(self, times):
+        """
+        Returns the indexes of the active uninherited and inherited timing point at each
+        of the given times, with -1 where there isn't one. Before the first uninherited
+        timing point, it's used as the active one, like osu!.
+        """
+        if len(self) == 0:
+            return np.full(np.shape(times), -1), np.full(np.shape(times), -1)
+        indexes = np.maximum(np.searchsorted(self.time, times, side="right") - 1, 0)
+        uninherited = self.uninherited[indexes]
+        ui_indexes = np.where(uninherited, indexes, self.parent_index[indexes])
+        first_uninherited = np.flatnonzero(self.uninherited)[:1]
+        if len(first_uninherited) > 0:
+            ui_indexes = np.where(ui_indexes >= 0, ui_indexes, first_uninherited[0])
+        i_indexes = np.where(uninherited, -1, indexes)
+        return ui_indexes, i_indexes
+
+    def bpm_at(self, time):
+        """NaN is returned if there are no uninherited timing points."""
+        if not np.any(self.uninherited):
+            return np.full(np.shape(time), np.nan)
+        ui_indexes, _ = self.resolve(time)
+        return 60000 / self.beat_length[ui_indexes]
+
+    def sv_at(self, time):
+        _, i_indexes = self.resolve(time)
+        if len(self) == 0:
+            return np.ones(np.shape(time))
+        return np.where(i_indexes >= 0, self.slider_velocity[i_indexes], 1)
+
+    def _create(self, index):
+        def optional(value):
+            return None if value == -1 else int(value)
+
+        time = float(self.time[index])
+        args = (self.sample_set[index], optional(self.sample_index[index]),
+                optional(self.volume[index]), optional(self.effects[index]))
+        if self.uninherited[index]:
+            timing_point = UninheritedTimingPoint(time, float(self.beat_length[index]),
+                                                  optional(self.meter[index]), *args)
+        else:
+            timing_point = InheritedTimingPoint(time, float(self.beat_length[index]), *args)
+            if self.parent_index[index] != -1:
+                timing_point.parent_timing_point = self[int(self.parent_index[index])]
+        self._timing_points[index] = timing_point
+        return timing_point
+
+    def __len__(self):
+        return len(self._timing_points)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        timing_point = self._timing_points[index]
+        if timing_point is None:
+            timing_point = self._create(range(len(self))[index])
+        return timing_point
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
 
 
 class Colour:
@@ -238,42 +337,84 @@ class Beatmap:
     __slots__ = (
         "reader", "version", "general", "editor", "metadata", "difficulty",
         "events", "timing_points", "colours", "hit_objects", "fully_loaded",
-        "max_combo", "hit_circle_count", "slider_count", "spinner_count"
+        "max_combo", "hit_circle_count", "slider_count", "spinner_count", "path_precision",
+        "stacking_difficulty"
     )
     STACK_DISTANCE = 3
-
-    def __init__(self, reader: BeatmapReader):
+    HEADER_SECTIONS = ("General", "Editor", "Metadata", "Difficulty")
+    # Sections that are needed to format the hit objects
+    HIT_OBJECT_DEPENDENCIES = ("General", "Difficulty", "TimingPoints")
+
+    def __init__(self, reader: BeatmapReader, path_precision=None):
+        """
+        path_precision is how closely slider paths are approximated, anything
+        path.get_precision takes. "fast" is much cheaper for jobs that don't need
+        gameplay accurate paths.
+        """
         self.reader = reader
+        self.path_precision = get_precision(path_precision)
         self.version: Union[int, None] = None
         self.general: Union[General, dict, None] = None
         self.editor: Union[Editor, dict, None] = None
         self.metadata: Union[Metadata, dict, None] = None
         self.difficulty: Union[Difficulty, dict, None] = None
         self.events: Union[Events, dict, None] = None
-        self.timing_points: Union[Sequence[Union[InheritedTimingPoint, UninheritedTimingPoint]], dict, None] = None
+        self.timing_points: Union[TimingPointList, Sequence[str], None] = None
         self.colours: Union[Colours, dict, None] = None
-        self.hit_objects: Union[Sequence[Union[HitCircle, Slider, Spinner, ManiaHoldKey]], dict, None] = None
+        self.hit_objects: Union[HitObjectList, Sequence[str], None] = None
 
         self.max_combo = None
         self.hit_circle_count = None
         self.slider_count = None
         self.spinner_count = None
+        # (approach_rate, circle_size) that stacking was last applied with
+        self.stacking_difficulty = None
 
         self.fully_loaded = False
 
     @classmethod
-    def from_path(cls, path):
-        return cls(BeatmapReader(path))
-
-    def load(self):
+    def from_path(cls, path, path_precision=None):
+        return cls(BeatmapReader(path), path_precision)
+
+    def load(self, sections=None):
+        """
+        Loads and formats the beatmap data. If sections is given, only those
+        sections of the file are read and formatted, and the rest are left as None.
+        Hit objects are created when they're first accessed, see HitObjectList for
+        how malformed ones are reported.
+        """
+        if sections is not None:
+            sections = set(sections)
+            if "HitObjects" in sections:
+                sections.update(self.HIT_OBJECT_DEPENDENCIES)
         try:
-            data = self.reader.load_beatmap_data()
+            data = self.reader.load_beatmap_data(sections)
         except:
             print(f"There was a problem while loading the data in {self.reader.path}\n{traceback.format_exc()}")
             return False
         if 'version' not in data:
             print(f"There was a problem while trying to identify the version of {self.reader.path}")
             return False
+        self._set_data(data)
+        try:
+            self._format_data()
+            self.fully_loaded = sections is None
+            return True
+        except:
+            print(f"There was a problem while formatting the data in {self.reader.path}\n{traceback.format_exc()}")
+            return False
+
+    def load_header(self):
+        return self.load(self.HEADER_SECTIONS)
+
+    def _set_summary(self, header, stats):
+        # Fills in a beatmap loaded by a SongsFolder worker or from a LibraryManifest
+        self._set_data(header)
+        self._format_data()
+        if stats is not None:
+            self.hit_circle_count, self.slider_count, self.spinner_count, self.max_combo = stats
+
+    def _set_data(self, data):
         self.version = data["version"]
         self.general = data.get("General")
         self.editor = data.get("Editor")
@@ -283,56 +424,72 @@ class Beatmap:
         self.timing_points = data.get("TimingPoints")
         self.colours = data.get("Colours")
         self.hit_objects = data.get("HitObjects")
-        try:
-            self._format_data()
-            return True
-        except:
-            print(f"There was a problem while formatting the data in {self.reader.path}\n{traceback.format_exc()}")
-            return False
 
     def _format_data(self):
         self.general = General(self.reader.path, self.general) if self.general is not None else None
         self.editor = Editor(self.editor) if self.editor is not None else None
         self.metadata = Metadata(self.metadata) if self.metadata is not None else None
         self.difficulty = Difficulty(self.difficulty) if self.difficulty is not None else None
-        self.timing_points = sorted(
-            list(map(TimingPoint, self.timing_points)),
-            key=lambda timing: timing.time) \
-            if self.timing_points is not None else None
-        self._set_parent_timing_points()
+        self.timing_points = TimingPointList(self.timing_points) if self.timing_points is not None else None
         self.colours = Colours(self.colours) if self.colours is not None else None
-        self.hit_objects = sorted(
-            list(map(
-                lambda data: get_hit_object(self, data[1], data[0]),
-                enumerate(self.hit_objects))),
-            key=lambda obj: obj.time) \
-            if self.hit_objects is not None else None
-
-        self._set_timing_points()
-        for hit_object in filter(lambda obj: obj.type == HitObjectType.SLIDER, self.hit_objects):
-            hit_object.calculate_time_attributes()
+        self.hit_objects = HitObjectList(self, self.hit_objects) if self.hit_objects is not None else None
+
+        if self.hit_objects is None:
+            return
         self.hit_circle_count, self.slider_count, self.spinner_count = self._calculate_object_amounts()
-        self.fully_loaded = True
 
-    def load_slider_paths(self):
-        for hit_object in filter(lambda obj: obj.type == HitObjectType.SLIDER, self.hit_objects):
-            hit_object.calculate_path()
+    def load_slider_paths(self, threads=None, path_cache: Union[SliderPathCache, None] = None):
+        """
+        If threads is more than 1, the sliders are split into that many chunks which are
+        calculated on a thread pool. sliderpath releases the GIL while it works, so the
+        chunks run in parallel. If a SliderPathCache is given, sliders that are in it
+        aren't calculated again. Paths are calculated with path_precision.
+        """
+        sliders = [hit_object for hit_object in self.hit_objects if hit_object.type == HitObjectType.SLIDER]
+        paths = [slider.path for slider in sliders]
+        if threads is not None and threads > 1 and len(paths) > 1:
+            chunk_size = -(-len(paths) // threads)
+            chunks = [paths[i:i+chunk_size] for i in range(0, len(paths), chunk_size)]
+            with ThreadPoolExecutor(threads) as executor:
+                list(executor.map(calculate_paths, chunks, [path_cache] * len(chunks),
+                                  [self.path_precision] * len(chunks)))
+        else:
+            calculate_paths(paths, path_cache, self.path_precision)
+        for slider in sliders:
+            slider.on_path_calculated()
 
     def load_slider_nested_objects(self):
         for hit_object in filter(lambda obj: obj.type == HitObjectType.SLIDER, self.hit_objects):
             hit_object.create_nested_objects()
 
-    def load_objects(self):
-        self.load_slider_paths()
+    def load_objects(self, cache: Union[ObjectCache, None] = None, threads=None,
+                     path_cache: Union[SliderPathCache, None] = None):
+        """
+        Calculates slider paths, stacking, nested objects and max combo. If an
+        ObjectCache is given, the results are restored from it when the beatmap is
+        cached and saved to it when it isn't. threads and path_cache are passed on to
+        load_slider_paths.
+        """
+        md5_hash = None
+        if cache is not None:
+            md5_hash = cache.get_hash(self.path)
+            if cache.restore(self, md5_hash):
+                return
+        self.load_slider_paths(threads, path_cache)
         self.apply_stacking()
         self.load_slider_nested_objects()
         self.max_combo = self._calculate_max_combo()
+        if cache is not None:
+            cache.save(self, md5_hash)
 
     def apply_stacking(self):
         if self.version >= 6:
             self._apply_stacking(0, len(self.hit_objects) - 1)
         else:
             self._apply_stacking_old()
+        self.hit_objects.columns.set_stack_heights([hit_object.stack_height for hit_object in self.hit_objects],
+                                                   HitObjectBase.get_scale(self.difficulty.circle_size))
+        self.stacking_difficulty = (self.difficulty.approach_rate, self.difficulty.circle_size)
 
     def _apply_stacking(self, start_index, end_index):
         extended_end_index = end_index
@@ -455,69 +612,63 @@ class Beatmap:
         return combo
 
     def _calculate_object_amounts(self):
-        hit_circles_count = 0
-        slider_count = 0
-        spinner_count = 0
-        for ho in self.hit_objects:
-            if ho.type == HitObjectType.HITCIRCLE:
-                hit_circles_count += 1
-            elif ho.type == HitObjectType.SLIDER:
-                slider_count += 1
-            elif ho.type == HitObjectType.SPINNER:
-                spinner_count += 1
-        return hit_circles_count, slider_count, spinner_count
-
-    def _set_parent_timing_points(self):
-        if self.timing_points is not None:
-            parent = None
-            for timing_point in self.timing_points:
-                if timing_point.type == TimingPointType.UNINHERITED:
-                    parent = timing_point
-                else:
-                    timing_point.parent_timing_point = parent
-
-    def _set_timing_points(self):
-        timing_i = 0
-        obj_i = 0
-        while obj_i < len(self.hit_objects):
-            offset = 0
-            while timing_i + offset < len(self.timing_points) and \
-                    self.hit_objects[obj_i].time >= self.timing_points[timing_i + offset].time:
-                offset += 1
-            timing_i = max(timing_i + offset - 1, 0)
-            if self.timing_points[timing_i].type == TimingPointType.UNINHERITED:
-                self.hit_objects[obj_i].ui_timing_point = self.timing_points[timing_i]
-            else:
-                self.hit_objects[obj_i].ui_timing_point = self.timing_points[timing_i].parent_timing_point
-                self.hit_objects[obj_i].i_timing_point = self.timing_points[timing_i]
-            obj_i += 1
+        return (
+            self.hit_objects.count(HitObjectType.HITCIRCLE),
+            self.hit_objects.count(HitObjectType.SLIDER),
+            self.hit_objects.count(HitObjectType.SPINNER)
+        )
 
     def apply_mods(self, mods: Mods):
         if type(self.difficulty) != Difficulty:
             raise TypeError("difficulty attribute is not formatted properly and so mods cannot be applied to it.")
-        if len(self.hit_objects) > 0 and not all(map(lambda ho: isinstance(ho, HitObjectBase), self.hit_objects)):
+        if type(self.hit_objects) != HitObjectList:
             raise TypeError("hit_objects is not formatted properly and so mods cannot be applied to it.")
         self.difficulty.reset_mods()
         if mods is not None:
             self.difficulty.apply_mods(mods)
-        for hit_object in self.hit_objects:
+        # Hit objects that haven't been created yet will pick up the new difficulty when they are
+        for hit_object in self.hit_objects.loaded():
             hit_object.on_difficulty_change()
+        columns = self.hit_objects.columns
+        columns.set_stack_heights(columns.stack_height, HitObjectBase.get_scale(self.difficulty.circle_size))
 
     @property
     def path(self):
         return self.reader.path
 
+    @property
+    def columns(self) -> Union[HitObjectColumns, None]:
+        return self.hit_objects.columns if isinstance(self.hit_objects, HitObjectList) else None
+
     def __iter__(self):
         return iter(self.hit_objects)
 
 
 class Beatmapset:
-    __slots__ = ("reader",)
+    __slots__ = ("reader", "path_cache", "_path_cache_size")
 
-    def __init__(self, reader: BeatmapsetReader):
+    def __init__(self, reader: BeatmapsetReader, path_cache_size=1024, path_precision=None):
         self.reader = reader
-        self.reader.discover_beatmaps()
-        self.reader.cast_beatmap_readers(Beatmap)
+        # Difficulties of a set often share sliders, the cache is created by load_objects
+        self.path_cache: Union[SliderPathCache, None] = None
+        self._path_cache_size = path_cache_size
+        if not self.reader.beatmaps:
+            self.reader.discover_beatmaps()
+        self.reader.cast_beatmap_readers(lambda beatmap_reader: Beatmap(beatmap_reader, path_precision))
+
+    def load_objects(self, cache: Union[ObjectCache, None] = None, threads=None):
+        """
+        Loads every beatmap in the set along with its objects, sharing slider paths
+        between them through path_cache. Returns the beatmaps that loaded.
+        """
+        if self.path_cache is None:
+            self.path_cache = SliderPathCache(self._path_cache_size)
+        loaded = []
+        for beatmap in self.beatmaps:
+            if beatmap.load():
+                beatmap.load_objects(cache, threads, self.path_cache)
+                loaded.append(beatmap)
+        return loaded
 
     @property
     def path(self):
@@ -534,16 +685,65 @@ class Beatmapset:
         return iter(self.beatmaps)
 
 
+LoadResult = namedtuple("LoadResult", ("path", "beatmap", "error", "columns"), defaults=(None,))
+
+
+def _load_beatmap_chunk(paths, stage, hash_contents=False, path_precision=None):
+    """
+    Runs in a worker of SongsFolder.load_all. Only the header sections, a tuple of
+    stats and for stage "objects" the HitObjectColumns are sent back, rather than a
+    pickled Beatmap.
+    """
+    results = []
+    sections = Beatmap.HEADER_SECTIONS if stage == "header" else None
+    for path in paths:
+        try:
+            reader = BeatmapReader(path)
+            md5_hash = None
+            if hash_contents:
+                # The whole file is needed for the hash anyway
+                with open(path, "rb") as f:
+                    raw = f.read()
+                md5_hash = hashlib.md5(raw).hexdigest()
+                data = reader.parse_beatmap_data(raw.splitlines(), sections)
+            else:
+                data = reader.load_beatmap_data(sections)
+            if "version" not in data:
+                raise ValueError(f"Could not identify the version of {path}")
+            header = {key: value for key, value in data.items() if key == "version" or key in Beatmap.HEADER_SECTIONS}
+            stats = columns = None
+            if stage == "objects":
+                beatmap = Beatmap(reader, path_precision)
+                beatmap._set_data(data)
+                beatmap._format_data()
+                # Chunks hold consecutive paths, so difficulties of a set mostly share a worker
+                beatmap.load_objects(path_cache=global_path_cache)
+                stats = (beatmap.hit_circle_count, beatmap.slider_count, beatmap.spinner_count, beatmap.max_combo)
+                columns = beatmap.columns
+            results.append((path, md5_hash, header, stats, columns, None))
+        except Exception:
+            results.append((path, None, None, None, None, traceback.format_exc()))
+    return results
+
+
 class SongsFolder:
-    __slots__ = ("reader",)
+    __slots__ = ("reader", "_discovery", "_pending")
 
-    def __init__(self, reader: SongsReader):
+    def __init__(self, reader: SongsReader, discover=True):
+        """
+        If discover is False, beatmapsets are only discovered once they're iterated
+        over or accessed.
+        """
         self.reader = reader
-        self.reader.discover_all_beatmapsets()
-        self.reader.cast_beatmapset_readers(Beatmapset)
+        # Discovery in progress, shared by every iter_beatmapsets until it finishes
+        self._discovery = None
+        self._pending = None
+        if discover:
+            self.reader.discover_all_beatmapsets()
+            self.reader.cast_beatmapset_readers(Beatmapset)
 
     @classmethod
-    def from_path(cls, path=None, confirmation_function=None):
+    def from_path(cls, path=None, confirmation_function=None, discover=True):
         path = path
         if path is None:
             print("Searching for osu! songs folder...")
@@ -551,12 +751,148 @@ class SongsFolder:
             path = search_for_songs_folder(*args)
             if path is None:
                 raise Exception("Bruh")  # TODO: b3uofqwfeniOGUWgbeuW
-        return cls(SongsReader(path))
+        return cls(SongsReader(path), discover)
 
     @property
     def beatmapsets(self) -> Sequence[Beatmapset]:
+        if not self.reader.discovered:
+            for _ in self.iter_beatmapsets():
+                pass
         return self.reader.beatmapsets
 
+    def iter_beatmapsets(self):
+        """
+        Yields each beatmapset as soon as it's discovered. Iterations that overlap,
+        e.g. accessing beatmapsets inside the loop, share one discovery, and
+        beatmapsets is only set once it's finished.
+        """
+        if self._discovery is None and not self.reader.discovered:
+            self._discovery = self.reader.iter_beatmapsets()
+            self._pending = []
+        i = 0
+        while not self.reader.discovered:
+            if i == len(self._pending):
+                reader = next(self._discovery, None)
+                if reader is None:
+                    self.reader.beatmapsets = self._pending
+                    self.reader.discovered = True
+                    self._discovery = self._pending = None
+                    return
+                self._pending.append(Beatmapset(reader))
+            yield self._pending[i]
+            i += 1
+        yield from self.reader.beatmapsets[i:]
+
+    def load_all(self, workers=None, stage="header", chunk_size=64, use_threads=False, path_precision=None):
+        """
+        Loads every beatmap in the folder across a pool of worker processes and yields
+        a LoadResult for each one as its chunk finishes. Errors are reported per path
+        in LoadResult.error instead of being raised.
+
+        stage "header" loads the General, Editor, Metadata and Difficulty sections.
+        stage "objects" additionally loads the hit objects in the worker to fill in the
+        object counts and max combo, and sends back their HitObjectColumns, with
+        stacking applied, in LoadResult.columns. The hit objects themselves are not
+        sent back.
+
+        With use_threads, a thread pool is used instead. Only the slider path
+        calculation runs without the GIL, so this mostly helps stage "objects" on
+        platforms where starting processes is expensive.
+
+        path_precision is used for the slider paths of stage "objects", see Beatmap.
+        """
+        self._check_stage(stage)
+        beatmaps = self._get_beatmaps_by_path()
+        for result, _, _, _ in self._load_in_pool(beatmaps, list(beatmaps), workers, stage, chunk_size,
+                                                  use_threads=use_threads, path_precision=path_precision):
+            yield result
+
+    def scan(self, manifest_path, workers=None, stage="header", chunk_size=64, use_threads=False,
+             path_precision=None):
+        """
+        Same as load_all, but backed by a LibraryManifest saved at manifest_path.
+        Beatmaps whose size and mtime match the manifest are filled in from it without
+        being read, only new or changed files are loaded, and entries of deleted files
+        are dropped. The manifest is saved once iteration stops. Beatmaps filled in
+        from the manifest have no LoadResult.columns.
+
+        Every loaded file is hashed. A file whose mtime changed but whose size didn't
+        is hashed again and only reloaded if its contents changed.
+
+        path_precision is used for the slider paths of stage "objects", see Beatmap.
+        """
+        self._check_stage(stage)
+        manifest = LibraryManifest.from_path(manifest_path, self.path)
+        try:
+            beatmaps = self._get_beatmaps_by_path()
+            manifest.prune(beatmaps)
+
+            file_stats = {}
+            for path, beatmap in beatmaps.items():
+                stat = os.stat(path)
+                entry = manifest.get(path, stat.st_size, stat.st_mtime_ns, need_stats=stage == "objects",
+                                     get_hash=ObjectCache.get_hash)
+                if entry is None:
+                    file_stats[path] = stat
+                    continue
+                try:
+                    beatmap._set_summary(entry.header, entry.stats)
+                    yield LoadResult(path, beatmap, None)
+                except Exception:
+                    file_stats[path] = stat
+
+            for result, md5_hash, header, stats in self._load_in_pool(
+                    beatmaps, list(file_stats), workers, stage, chunk_size, hash_contents=True,
+                    use_threads=use_threads, path_precision=path_precision):
+                if result.error is None:
+                    stat = file_stats[result.path]
+                    manifest.update(result.path, stat.st_size, stat.st_mtime_ns, md5_hash, header, stats)
+                yield result
+        finally:
+            manifest.save()
+
+    def _get_beatmaps_by_path(self):
+        return {beatmap.path: beatmap for beatmapset in self for beatmap in beatmapset}
+
+    @staticmethod
+    def _check_stage(stage):
+        if stage not in ("header", "objects"):
+            raise ValueError(f"Invalid stage {stage!r}, must be 'header' or 'objects'")
+
+    @staticmethod
+    def _load_in_pool(beatmaps, paths, workers, stage, chunk_size, hash_contents=False, use_threads=False,
+                      path_precision=None):
+        if not paths:
+            return
+        executor_cls = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+        executor = executor_cls(workers)
+        futures = {}
+        try:
+            for i in range(0, len(paths), chunk_size):
+                chunk = paths[i:i+chunk_size]
+                futures[executor.submit(_load_beatmap_chunk, chunk, stage, hash_contents, path_precision)] = chunk
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception:
+                    # The pool broke, e.g. a worker process was killed
+                    error = traceback.format_exc()
+                    results = [(path, None, None, None, None, error) for path in futures[future]]
+                for path, md5_hash, header, stats, columns, error in results:
+                    beatmap = beatmaps[path]
+                    if error is None:
+                        try:
+                            beatmap._set_summary(header, stats)
+                        except Exception:
+                            error = traceback.format_exc()
+                            columns = None
+                    yield LoadResult(path, beatmap, error, columns), md5_hash, header, stats
+        finally:
+            # Don't wait for the chunks that are left if iteration stopped early
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     @property
     def path(self):
         return self.reader.path
@@ -565,4 +901,4 @@ class SongsFolder:
         return self.beatmapsets[index]
 
     def __iter__(self):
-        return iter(self.beatmapsets)
+        return self.iter_beatmapsets()
@@ -6,10 +6,27 @@ try:
         approximate_catmull,
         calculate_length
     )
-except ModuleNotFoundError:
-    print("WARNING: Could not import sliderpath.pyd")
+except ImportError:
+    # The extension isn't built for this platform, fall back to the NumPy version
+    from .sliderpath_numpy import (
+        approximate_bezier,
+        approximate_circular_arc,
+        approximate_catmull,
+        calculate_length,
+        calculate_paths as _calculate_paths
+    )
+else:
+    try:
+        from .sliderpath import calculate_paths as _calculate_paths
+    except ImportError:
+        # Builds of the extension from before the batched entry point
+        from .sliderpath_numpy import calculate_paths as _calculate_paths
 from .util import clamp
+from typing import Sequence, Union
+from collections import OrderedDict, namedtuple
 import math
+import operator
+import threading
 import numpy as np
 
 
@@ -116,10 +133,41 @@ class Points(list):
             )))
 
 
-def approximate_linear(points):
+def approximate_linear(points, precision=None):
     return points
 
 
+PathPrecision = namedtuple("PathPrecision", ("bezier_tolerance", "catmull_detail", "circular_arc_tolerance"))
+# Same as osu!, and sliderpathsrc/constants.h
+DEFAULT_PRECISION = PathPrecision(0.25, 50, 0.1)
+# Less than half the points, for when only the rough shape or the end position matters
+FAST_PRECISION = PathPrecision(1.0, 10, 1.0)
+PRECISION_PRESETS = {"default": DEFAULT_PRECISION, "fast": FAST_PRECISION}
+
+
+def get_precision(precision=None) -> PathPrecision:
+    """
+    Takes a PathPrecision or a tuple of its values, the name of a preset in
+    PRECISION_PRESETS or None for the default. Values are converted so that
+    equal precisions compare and format the same, e.g. (1, 10, 1) and FAST_PRECISION.
+    """
+    if precision is None:
+        return DEFAULT_PRECISION
+    if isinstance(precision, str):
+        if precision not in PRECISION_PRESETS:
+            raise ValueError(f"Invalid precision {precision!r}, must be one of {', '.join(PRECISION_PRESETS)}")
+        return PRECISION_PRESETS[precision]
+    bezier_tolerance, catmull_detail, circular_arc_tolerance = precision
+    return PathPrecision(float(bezier_tolerance), operator.index(catmull_detail), float(circular_arc_tolerance))
+
+
+def _as_points(data):
+    # The extension returns packed float64 (x, y) pairs
+    if isinstance(data, bytes):
+        return np.frombuffer(data, dtype=np.float64).reshape(-1, 2)
+    return np.asarray(data, dtype=np.float64).reshape(-1, 2)
+
+
 class SliderPath:
     __slots__ = (
         "points", "expected_distance", "type", "calculated_path",
@@ -139,15 +187,17 @@ class SliderPath:
         self.segmentEnds = []
         self.calculated = False
 
-    def calculate(self):
-        self.calculate_path()
+    def calculate(self, cache: Union['SliderPathCache', None] = None, precision=None):
+        """precision is anything get_precision takes."""
+        if cache is not None:
+            calculate_paths([self], cache, precision)
+            return
+        self.calculate_path(precision)
         self.calculate_length()
-        self.calculated_path = np.array(self.calculated_path)
-        self.cumulative_distance = np.array(self.cumulative_distance)
-        self.segmentEnds = np.array(self.segmentEnds)
         self.calculated = True
 
-    def calculate_subpath(self, segment):
+    def calculate_subpath(self, segment, precision=None):
+        precision = get_precision(precision)
         segment = self.get_primitive_points(segment)
         if self.type == CurveType.PERFECT and len(segment) != 3:
             calc_func = approximate_bezier
@@ -155,35 +205,52 @@ class SliderPath:
             calc_func = globals()[
                 "approximate_" + ("linear", "circular_arc", "bezier", "catmull")[int(self.type)]]
 
-        path = calc_func(segment)
+        path = _as_points(calc_func(segment, precision))
         if len(path) == 0:
-            return approximate_bezier(segment)
+            return _as_points(approximate_bezier(segment, precision))
         return path
 
-    def calculate_path(self):
-        self.calculated_path = []
-        self.segmentEnds = []
-
-        if len(self.points) == 0:
-            return
-
+    def get_segments(self):
+        """Splits the control points into the segments that are approximated separately."""
+        segments = []
         start = 0
         for i in range(len(self.points)):
             if (not self.points[i].anchor_point and i != 0) and i < len(self.points)-1:
                 continue
-            segment = self.points[start:i + 1]
-
-            for point in self.calculate_subpath(segment):
-                if len(self.calculated_path) == 0 or not self.compare_points(self.calculated_path[-1], point):
-                    self.calculated_path.append(point)
-
-            self.segmentEnds.append(len(self.calculated_path) - 1)
+            segments.append(self.points[start:i + 1])
             start = i
+        return segments
+
+    def calculate_path(self, precision=None):
+        precision = get_precision(precision)
+        paths = []
+        segment_ends = []
+        length = 0
+        last_key = None
+
+        for segment in self.get_segments():
+            path = self.calculate_subpath(segment, precision)
+            if len(path) > 0:
+                # Drop points that are the same as the one before them, to 5 decimals like compare_points
+                keys = np.rint(path * 1e5)
+                keep = np.ones(len(path), dtype=bool)
+                keep[1:] = (keys[1:] != keys[:-1]).any(axis=1)
+                if last_key is not None:
+                    keep[0] = (keys[0] != last_key).any()
+                paths.append(path[keep])
+                length += int(keep.sum())
+                last_key = keys[-1]
+            segment_ends.append(length - 1)
+
+        self.calculated_path = np.concatenate(paths) if paths else np.zeros((0, 2))
+        self.segmentEnds = np.array(segment_ends, dtype=np.float64)
 
     def calculate_length(self):
-        self.calculated_path, self.segmentEnds, self.cumulative_distance = \
-            calculate_length(self.get_primitive_points(self.points), self.calculated_path,
-                             self.segmentEnds, self.expected_distance)
+        path, segment_ends, cumulative_distance = calculate_length(
+            self.get_primitive_points(self.points), self.calculated_path, self.segmentEnds, self.expected_distance)
+        self.calculated_path = _as_points(path)
+        self.segmentEnds = np.frombuffer(segment_ends, dtype=np.float64)
+        self.cumulative_distance = np.frombuffer(cumulative_distance, dtype=np.float64)
 
     def get_approximate_distance_index(self, distance):
         low = 0
@@ -219,6 +286,32 @@ class SliderPath:
         except (ZeroDivisionError, RuntimeWarning):
             return p0
 
+    def positions_at(self, progress):
+        """
+        Same as position_at for an array of progress values, returning the positions
+        as an array of shape progress.shape + (2,).
+        """
+        progress = np.asarray(progress, dtype=np.float64)
+        if len(self.calculated_path) == 0:
+            return np.zeros(progress.shape + (2,))
+        path = np.asarray(self.calculated_path, dtype=np.float64).reshape(-1, 2)
+        cumulative_distance = np.asarray(self.cumulative_distance, dtype=np.float64)
+        distance = np.clip(progress, 0, 1) * self.calculated_distance
+
+        # Searching to the right means an exact match interpolates from that point with a weight of 0
+        index = np.searchsorted(cumulative_distance, distance, side="right")
+        inside = (index > 0) & (index < len(path))
+        i = np.clip(index, 1, len(path) - 1)
+        p0, p1 = path[i - 1], path[i]
+        d0, d1 = cumulative_distance[i - 1], cumulative_distance[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            w = np.where(inside, (distance - d0) / (d1 - d0), 0)
+        positions = p0 + (p1 - p0) * w[..., None]
+
+        positions[index <= 0] = path[0]
+        positions[index >= len(path)] = path[-1]
+        return positions
+
     @property
     def calculated_distance(self):
         return 0 if len(self.cumulative_distance) == 0 else self.cumulative_distance[-1]
@@ -230,3 +323,188 @@ class SliderPath:
     @staticmethod
     def get_primitive_points(points):
         return [(point.position.x, point.position.y) for point in points]
+
+
+PathCacheStats = namedtuple("PathCacheStats", ("hits", "misses", "size", "max_size"))
+
+
+class SliderPathCache:
+    """
+    LRU cache of calculated slider paths, keyed by the curve type, the control points
+    relative to the slider's head, the expected length and the precision, so identical
+    sliders in other difficulties or elsewhere in the same map are only calculated once.
+
+    Cached paths are calculated at the origin and moved to each slider's head, so the
+    positions can differ from an uncached calculation in the last few bits. Lookups
+    are locked, which lets one cache be shared by threads.
+    """
+
+    __slots__ = ("max_size", "hits", "misses", "_entries", "_lock")
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(path: SliderPath, precision=None):
+        x, y = path.points[0].position
+        return (
+            int(path.type),
+            tuple((point.position.x - x, point.position.y - y, point.anchor_point) for point in path.points),
+            path.expected_distance,
+            get_precision(precision)
+        )
+
+    def lookup(self, keys):
+        """
+        Returns the cached value of each key, or None if it isn't cached. A key that
+        isn't cached counts as one miss however many times it's given, since it only
+        needs calculating once, and every other key counts as a hit.
+        """
+        values = {}
+        with self._lock:
+            for key in keys:
+                if key in values:
+                    self.hits += 1
+                    continue
+                value = self._entries.get(key)
+                if value is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                values[key] = value
+        return values
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        return PathCacheStats(self.hits, self.misses, len(self._entries), self.max_size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Can be passed anywhere a SliderPathCache is taken to share paths across the whole process
+global_path_cache = SliderPathCache()
+
+
+def _calculate_packed(paths, relative=False, precision=DEFAULT_PRECISION):
+    """
+    Calculates paths with a single call into the sliderpath extension and returns the
+    path, cumulative distance and segment ends of each one as views of the packed
+    results, or None for a path that failed. If relative is True, each path is
+    calculated at the origin.
+    """
+    points, segment_offsets, slider_offsets = [], [0], [0]
+    for path in paths:
+        x, y = path.points[0].position if relative else (0, 0)
+        for segment in path.get_segments():
+            points.extend((point.position.x - x, point.position.y - y) for point in segment)
+            segment_offsets.append(len(points))
+        slider_offsets.append(len(segment_offsets) - 1)
+
+    path_data, path_offsets, distance_data, distance_offsets, segment_end_data, failed = _calculate_paths(
+        np.array(points, dtype=np.float64),
+        np.array(segment_offsets, dtype=np.int64),
+        np.array(slider_offsets, dtype=np.int64),
+        np.array([int(path.type) for path in paths], dtype=np.int64),
+        np.array([path.expected_distance for path in paths], dtype=np.float64),
+        precision
+    )
+    # Copied out of the returned bytes so the paths are writable, like SliderPath.calculate's
+    calculated_paths = np.frombuffer(path_data, dtype=np.float64).reshape(-1, 2).copy()
+    distances = np.frombuffer(distance_data, dtype=np.float64).copy()
+    segment_ends = np.frombuffer(segment_end_data, dtype=np.float64).copy()
+    path_offsets = np.frombuffer(path_offsets, dtype=np.int64).tolist()
+    distance_offsets = np.frombuffer(distance_offsets, dtype=np.int64).tolist()
+    failed = np.frombuffer(failed, dtype=np.uint8).tolist()
+
+    return [
+        (calculated_paths[path_offsets[i]:path_offsets[i+1]],
+         distances[distance_offsets[i]:distance_offsets[i+1]],
+         segment_ends[slider_offsets[i]:slider_offsets[i+1]])
+        if not failed[i] else None
+        for i in range(len(paths))
+    ]
+
+
+def _calculate_failed(paths, precision):
+    # Paths the batch couldn't calculate are calculated on their own, so a bad slider
+    # raises the same error as SliderPath.calculate, after the rest have been set
+    error = None
+    for path in paths:
+        try:
+            path.calculate(precision=precision)
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        raise error
+
+
+def calculate_paths(paths: Sequence[SliderPath], cache: Union[SliderPathCache, None] = None, precision=None):
+    """
+    Calculates slider paths with a single call into the sliderpath extension, giving
+    the same results as SliderPath.calculate. The control points of every segment are
+    packed into one array and the results are unpacked as views of packed arrays.
+
+    If a SliderPathCache is given, only the paths that aren't cached are calculated.
+    They're copied out of the packed arrays before being cached, so an entry doesn't
+    keep the rest of its batch alive. Cached entries are read only, each path gets its
+    own copy. precision is anything get_precision takes.
+
+    A path the batch fails on is calculated on its own with SliderPath.calculate. If
+    that fails too, its error is raised once every other path has been set.
+    """
+    if len(paths) == 0:
+        return
+    precision = get_precision(precision)
+    if cache is None:
+        failed = []
+        for path, value in zip(paths, _calculate_packed(paths, precision=precision)):
+            if value is None:
+                failed.append(path)
+                continue
+            path.calculated_path, path.cumulative_distance, path.segmentEnds = value
+            path.calculated = True
+        _calculate_failed(failed, precision)
+        return
+
+    keys = [cache.get_key(path, precision) for path in paths]
+    values = cache.lookup(keys)
+    missing = {key: path for key, path in zip(keys, paths) if values[key] is None}
+    if missing:
+        for key, value in zip(missing, _calculate_packed(list(missing.values()), True, precision)):
+            if value is None:
+                continue
+            value = tuple(map(np.copy, value))
+            for array in value:
+                array.flags.writeable = False
+            values[key] = value
+            cache.put(key, value)
+
+    failed = []
+    for path, key in zip(paths, keys):
+        if values[key] is None:
+            failed.append(path)
+            continue
+        calculated_path, cumulative_distance, segment_ends = values[key]
+        path.calculated_path = calculated_path + tuple(path.points[0].position)
+        path.cumulative_distance = cumulative_distance.copy()
+        path.segmentEnds = segment_ends.copy()
+        path.calculated = True
+    _calculate_failed(failed, precision)
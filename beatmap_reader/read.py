@@ -1,73 +1,124 @@
 import os
-from .util import is_beatmapset
+from .util import iter_beatmap_files
 
 
 class SongsReader:
     def __init__(self, path):
         self.path = path
         self.beatmapsets = []
+        self.discovered = False
 
     def cast_beatmapset_readers(self, cast_to):
         self.beatmapsets = list(map(cast_to, self.beatmapsets))
 
+    def iter_beatmapsets(self):
+        """
+        Yields a BeatmapsetReader for each beatmapset as it's found. Each directory
+        is only listed once, and the readers come with their beatmaps already discovered.
+        """
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                beatmaps = list(iter_beatmap_files(entry.path))
+                if beatmaps:
+                    yield BeatmapsetReader(entry.path, beatmaps)
+
     def discover_all_beatmapsets(self):
-        for beatmapset in os.listdir(self.path):
-            beatmapset = os.path.join(self.path, beatmapset)
-            if not os.path.isdir(beatmapset):
-                continue
-            if not is_beatmapset(beatmapset):
-                continue
-            self.beatmapsets.append(BeatmapsetReader(beatmapset))
+        self.beatmapsets.extend(self.iter_beatmapsets())
+        self.discovered = True
 
 
 class BeatmapsetReader:
-    def __init__(self, path):
+    def __init__(self, path, beatmap_paths=None):
         self.path = path
-        self.beatmaps = []
+        self.beatmaps = list(map(BeatmapReader, beatmap_paths)) if beatmap_paths is not None else []
 
     def cast_beatmap_readers(self, cast_to):
         self.beatmaps = list(map(cast_to, self.beatmaps))
 
     def discover_beatmaps(self):
-        for beatmap in os.listdir(self.path):
-            full_beatmap = os.path.join(self.path, beatmap)
-            if beatmap.endswith(".osu") and not os.path.isdir(full_beatmap):
-                self.beatmaps.append(BeatmapReader(full_beatmap))
+        self.beatmaps.extend(map(BeatmapReader, iter_beatmap_files(self.path)))
 
 
 class BeatmapReader:
     key_value_sections = (
         "General", "Editor", "Metadata", "Difficulty", "Colours"
     )
+    # Size of the chunks a file is streamed in when only some sections are read
+    CHUNK_SIZE = 1 << 16
 
     def __init__(self, path):
         self.path = path
 
-    def load_beatmap_data(self):
+    def load_beatmap_data(self, sections=None):
+        with open(self.path, "rb") as f:
+            if sections is None:
+                return self.parse_beatmap_data(f.read().splitlines())
+            # Stream the file so reading can stop once the requested sections are done
+            return self.parse_beatmap_data(self.iter_lines(f), sections)
+
+    @classmethod
+    def iter_lines(cls, f):
+        """
+        Yields the lines of a binary file, read in chunks. Lines can end with \\n, \\r\\n
+        or \\r, the same as bytes.splitlines.
+        """
+        rest = b""
+        while True:
+            chunk = f.read(cls.CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (rest + chunk).splitlines(True)
+            # The last line may continue in the next chunk, including a \r followed by \n
+            rest = lines.pop() if not lines[-1].endswith(b"\n") else b""
+            yield from lines
+        if rest:
+            yield rest
+
+    @classmethod
+    def parse_beatmap_data(cls, lines, sections=None):
+        """
+        Tokenizes the lines (as bytes) of a .osu file in a single pass. Only section names,
+        key-value pairs and list section lines get decoded; comments and blank lines
+        are skipped as bytes.
+
+        If sections is given, any other section is skipped without being decoded and
+        tokenizing stops as soon as every requested section has been read, or at
+        HitObjects, the last section, if it isn't requested.
+        """
         data = {}
-        with open(self.path, "r", encoding="utf-8") as f:
-            current_section = None
-            for line in f.readlines():
-                line = line[:-1]
-                ascii_line = "".join(filter(lambda char: char.isascii(), line))
-                if line.strip() == "" or line.startswith("//"):
-                    continue
-                if current_section is None and ascii_line.startswith("osu file format"):
-                    data.update({"version": int(ascii_line[17:].strip())})
-                    continue
-                if line.startswith("[") and line.endswith("]"):
-                    current_section = line[1:-1]
-                    data.update({current_section: {} if current_section in self.key_value_sections else []})
-                    continue
-                if current_section is None:
-                    continue
-                if current_section in self.key_value_sections:
-                    # Done this way for safety
-                    split = line.split(":")
-                    key = split[0].strip()
-                    value = ":".join(split[1:]).strip()
-
-                    data[current_section].update({key: value})
-                else:
-                    data[current_section].append(line.strip())
+        section = None
+        is_key_value = False
+        skipping = False
+        remaining = set(sections) if sections is not None else None
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith(b"//"):
+                continue
+            if line[0] == 91 and line[-1] == 93:  # [Section]
+                name = line[1:-1].decode("utf-8")
+                if remaining is not None:
+                    if not remaining or (name == "HitObjects" and name not in remaining):
+                        break
+                    skipping = name not in remaining
+                    if skipping:
+                        continue
+                    remaining.remove(name)
+                is_key_value = name in cls.key_value_sections
+                section = data[name] = {} if is_key_value else []
+                continue
+            if skipping:
+                continue
+            if section is None:
+                # The header can be preceded by a BOM or other junk, so search for it
+                index = line.find(b"osu file format v")
+                if index != -1:
+                    data["version"] = int(line[index+17:])
+                continue
+            if is_key_value:
+                key, _, value = line.partition(b":")
+                section[key.strip().decode("utf-8")] = value.strip().decode("utf-8")
+            else:
+                section.append(line.decode("utf-8"))
         return data
@@ -0,0 +1,399 @@
+"""
+NumPy implementation of the sliderpath extension, used when it can't be imported.
+The functions take and return the same values as their counterparts in
+sliderpathsrc/sliderpath.c (as arrays rather than bytes) and do the arithmetic in
+the same order, so the results match the extension and it can be checked against
+this module.
+"""
+import numpy as np
+import operator
+
+
+# Same as sliderpathsrc/constants.h, used when no precision is given
+BEZIER_TOLERANCE = np.float32(0.25)
+CATMULL_DETAIL = 50
+CIRCULAR_ARC_TOLERANCE = np.float32(0.1)
+DOUBLE_EPSILON = 1e-7
+
+CURVE_LINEAR = 0
+CURVE_PERFECT = 1
+CURVE_BEZIER = 2
+CURVE_CATMULL = 3
+
+
+def _as_points(points):
+    return np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+
+
+def _magnitude(x, y):
+    return np.sqrt(x * x + y * y)
+
+
+def _split(values, offsets):
+    return [values[offsets[i]:offsets[i+1]] for i in range(len(offsets) - 1)]
+
+
+def _parse_precision(precision, func_name):
+    # Tolerances are floats in the extension's PathPrecision struct
+    if precision is None:
+        return BEZIER_TOLERANCE, CATMULL_DETAIL, CIRCULAR_ARC_TOLERANCE
+    try:
+        bezier_tolerance, catmull_detail, circular_arc_tolerance = precision
+        catmull_detail = operator.index(catmull_detail)
+    except (TypeError, ValueError):
+        raise TypeError(f"precision given to {func_name} must be a "
+                        "(bezier_tolerance, catmull_detail, circular_arc_tolerance) tuple") from None
+    bezier_tolerance, circular_arc_tolerance = np.float32(bezier_tolerance), np.float32(circular_arc_tolerance)
+    if not (bezier_tolerance > 0 and catmull_detail > 0 and circular_arc_tolerance > 0):
+        raise ValueError(f"Invalid precision given to {func_name}")
+    return bezier_tolerance, catmull_detail, circular_arc_tolerance
+
+
+# bezier
+
+def _is_flat_enough(curves, tolerance):
+    if curves.shape[1] < 3:
+        return np.ones(len(curves), dtype=bool)
+    v = curves[:, :-2] - 2 * curves[:, 1:-1] + curves[:, 2:]
+    magnitude = _magnitude(v[..., 0], v[..., 1])
+    return ~(magnitude * magnitude > np.float64(tolerance * tolerance * np.float32(4))).any(axis=1)
+
+
+def _subdivide(curves):
+    n = curves.shape[1]
+    midpoints = curves.copy()
+    left = np.empty_like(curves)
+    right = np.empty_like(curves)
+    for i in range(n):
+        left[:, i] = midpoints[:, 0]
+        right[:, n-i-1] = midpoints[:, n-i-1]
+        midpoints[:, :n-i-1] = (midpoints[:, :n-i-1] + midpoints[:, 1:n-i]) / 2
+    return left, right
+
+
+def _approximate_flat(curves, left, right):
+    n = curves.shape[1]
+    if n <= 2:
+        return curves[:, :1]
+    joined = np.concatenate([left, right[:, 1:]], axis=1)
+    middle = 0.25 * (joined[:, 1:2*n-4:2] + 2 * joined[:, 2:2*n-3:2] + joined[:, 3:2*n-2:2])
+    return np.concatenate([curves[:, :1], middle], axis=1)
+
+
+def approximate_bezier_batch(curves, tolerance=BEZIER_TOLERANCE):
+    """
+    Approximates a (K, n, 2) array of bezier curves that all have n control points.
+    Instead of flattening one curve at a time, every curve of a subdivision level is
+    checked and split at once. Returns the points of all curves back to back along
+    with the offsets of each curve's points.
+    """
+    count, n = curves.shape[:2]
+    leaf_size = max(1, n - 1)
+
+    # Flat curves are approximated, the rest are split into a left and right child
+    # which are adjacent in the next level
+    levels = []
+    nodes = np.ascontiguousarray(curves, dtype=np.float64)
+    owners = np.arange(count)
+    while len(nodes) > 0:
+        flat = _is_flat_enough(nodes, tolerance)
+        left, right = _subdivide(nodes)
+        levels.append((flat, owners[flat], _approximate_flat(nodes[flat], left[flat], right[flat])))
+        nodes = np.stack([left[~flat], right[~flat]], axis=1).reshape(-1, n, 2)
+        owners = np.repeat(owners[~flat], 2)
+
+    # Count the leaves under every node, then walk back down giving each node the index
+    # of its first leaf, which puts the leaves in the same order as the depth first C version
+    leaf_counts = [None] * len(levels)
+    child_counts = None
+    for depth in range(len(levels) - 1, -1, -1):
+        flat = levels[depth][0]
+        counts = np.ones(len(flat), dtype=np.int64)
+        if child_counts is not None:
+            counts[~flat] = child_counts[0::2] + child_counts[1::2]
+        leaf_counts[depth] = child_counts = counts
+
+    root_counts = leaf_counts[0] if levels else np.zeros(0, dtype=np.int64)
+    root_starts = np.cumsum(root_counts) - root_counts
+    # Each curve also ends with its last control point
+    offsets = np.append(root_starts * leaf_size + np.arange(count), root_counts.sum() * leaf_size + count)
+    output = np.empty((offsets[-1], 2), dtype=np.float64)
+    output[offsets[1:] - 1] = curves[:, -1]
+
+    starts = root_starts
+    for depth, (flat, leaf_owners, points) in enumerate(levels):
+        positions = starts[flat] * leaf_size + leaf_owners
+        output[(positions[:, None] + np.arange(leaf_size)).ravel()] = points.reshape(-1, 2)
+        if depth + 1 < len(levels):
+            children = np.empty(2 * int((~flat).sum()), dtype=np.int64)
+            children[0::2] = starts[~flat]
+            children[1::2] = starts[~flat] + leaf_counts[depth + 1][0::2]
+            starts = children
+    return output, offsets
+
+
+def approximate_bezier(points, precision=None):
+    bezier_tolerance, _, _ = _parse_precision(precision, "approximate_bezier")
+    points = _as_points(points)
+    if len(points) <= 0:
+        raise ValueError("The list given to bezier calculate has 1 or less points")
+    return approximate_bezier_batch(points[None], bezier_tolerance)[0]
+
+
+# catmull
+
+def _catmull_calc_point(n1, n2, n3, n4, t, t2, t3):
+    return 0.5 * (2.0 * n2 + (-n1 + n3) * t + (2.0 * n1 - 5.0 * n2 + 4.0 * n3 - n4) * t2 +
+                  (-n1 + 3.0 * n2 - 3.0 * n3 + n4) * t3)
+
+
+def approximate_catmull_batch(points, starts, lengths, detail=CATMULL_DETAIL):
+    """
+    Approximates the catmull curves whose control points are points[start:start+length],
+    all of which need at least 2 points. Every pair of adjacent control points is
+    calculated at once. Returns the points of all curves back to back along with the
+    offsets of each curve's points.
+    """
+    pair_counts = lengths - 1
+    curve_starts = np.repeat(starts, pair_counts)
+    last = np.repeat(starts + lengths - 1, pair_counts)
+    i = np.arange(pair_counts.sum()) - np.repeat(np.cumsum(pair_counts) - pair_counts, pair_counts)
+    index = curve_starts + i
+
+    v1 = points[index - (i > 0)][:, None]
+    v2 = points[index][:, None]
+    v3 = points[index + 1][:, None]
+    v4 = np.where((index + 2 <= last)[:, None, None], points[np.minimum(index + 2, last)][:, None], v3 * 2 - v2)
+
+    t = np.arange(detail + 1)[:, None] / detail
+    t2 = t * t
+    t3 = t * t2
+    curve = _catmull_calc_point(v1, v2, v3, v4, t, t2, t3)
+    # Each step adds the points at c/detail and (c+1)/detail
+    steps = np.repeat(np.arange(detail + 1), 2)[1:-1]
+    output = curve[:, steps].reshape(-1, 2)
+    return output, np.append(0, np.cumsum(pair_counts * 2 * detail))
+
+
+def approximate_catmull(points, precision=None):
+    _, catmull_detail, _ = _parse_precision(precision, "approximate_catmull")
+    points = _as_points(points)
+    if len(points) == 0:
+        raise ValueError("approximate_catmull failed to calculate the slider path")
+    if len(points) == 1:
+        return np.zeros((0, 2), dtype=np.float64)
+    return approximate_catmull_batch(points, np.array([0]), np.array([len(points)]), catmull_detail)[0]
+
+
+# circular arc
+
+def approximate_circular_arc_batch(curves, tolerance=CIRCULAR_ARC_TOLERANCE):
+    """
+    Approximates a (K, 3, 2) array of circular arcs. Returns the points of all arcs back
+    to back, the offsets of each arc's points and a mask of which arcs were valid.
+    Invalid arcs have no points and should be approximated as bezier curves instead.
+    """
+    ax, ay = curves[:, 0, 0], curves[:, 0, 1]
+    bx, by = curves[:, 1, 0], curves[:, 1, 1]
+    cx, cy = curves[:, 2, 0], curves[:, 2, 1]
+    valid = ~(np.abs((by - ay) * (cx - ax) - (bx - ax) * (cy - ay)) <= DOUBLE_EPSILON)
+    ax, ay, bx, by, cx, cy = (values[valid] for values in (ax, ay, bx, by, cx, cy))
+
+    with np.errstate(all="ignore"):
+        d = 2 * (ax * (by - cy) + bx * (cy - ay) + cx * (ay - by))
+        a_sq = _magnitude(ax, ay) ** 2
+        b_sq = _magnitude(bx, by) ** 2
+        c_sq = _magnitude(cx, cy) ** 2
+        center_x = (a_sq * (by - cy) + b_sq * (cy - ay) + c_sq * (ay - by)) / d
+        center_y = (a_sq * (cx - bx) + b_sq * (ax - cx) + c_sq * (bx - ax)) / d
+
+        # The radius is stored as a float in CircularArcProperties
+        radius = _magnitude(ax - center_x, ay - center_y).astype(np.float32)
+        theta_start = np.arctan2(ay - center_y, ax - center_x)
+        theta_end = np.arctan2(cy - center_y, cx - center_x)
+        theta_end = np.where(theta_end < theta_start, theta_end + 2 * np.pi, theta_end)
+        theta_range = theta_end - theta_start
+        clockwise = (cy - ay) * (bx - ax) + -(cx - ax) * (by - ay) < 0
+        direction = np.where(clockwise, -1.0, 1.0)
+        theta_range = np.where(clockwise, 2 * np.pi - theta_range, theta_range)
+
+        steps = np.ceil(theta_range / (2 * np.arccos((1 - tolerance / radius).astype(np.float64))))
+        # Anything the int cast in C can't represent ends up as 2 points
+        point_counts = np.where((steps > 2) & (steps < 2 ** 31), steps, 2).astype(np.int64)
+        point_counts[2 * radius <= tolerance] = 2
+
+        owner = np.repeat(np.arange(len(point_counts)), point_counts)
+        i = np.arange(len(owner)) - np.repeat(np.cumsum(point_counts) - point_counts, point_counts)
+        fract = i / (point_counts[owner] - 1)
+        theta = theta_start[owner] + direction[owner] * fract * theta_range[owner]
+        output = np.empty((len(owner), 2), dtype=np.float64)
+        output[:, 0] = (np.cos(theta).astype(np.float32) * radius[owner]).astype(np.float64) + center_x[owner]
+        output[:, 1] = (np.sin(theta).astype(np.float32) * radius[owner]).astype(np.float64) + center_y[owner]
+
+    counts = np.zeros(len(curves), dtype=np.int64)
+    counts[valid] = point_counts
+    return output, np.append(0, np.cumsum(counts)), valid
+
+
+def approximate_circular_arc(points, precision=None):
+    bezier_tolerance, _, circular_arc_tolerance = _parse_precision(precision, "approximate_circular_arc")
+    points = _as_points(points)
+    if len(points) < 3:
+        raise ValueError("approximate_circular_arc failed to calculate the slider path")
+    output, _, valid = approximate_circular_arc_batch(points[None, :3], circular_arc_tolerance)
+    if not valid[0]:
+        return approximate_bezier_batch(points[None], bezier_tolerance)[0]
+    return output
+
+
+# length
+
+def calculate_length(points, path, segment_ends, expected_distance):
+    """
+    Returns the path cut or extended to expected_distance, the segment ends and the
+    cumulative distance along the path.
+    """
+    points = _as_points(points)
+    path = _as_points(path).copy()
+    segment_ends = np.array(segment_ends, dtype=np.float64).reshape(-1)
+    if len(path) == 0:
+        raise ValueError("calculate_length failed to calculate the slider path")
+
+    diff = path[1:] - path[:-1]
+    cumulative_distance = np.append(0.0, np.add.accumulate(_magnitude(diff[:, 0], diff[:, 1])))
+    calculated_length = cumulative_distance[-1]
+    if expected_distance == calculated_length:
+        return path, segment_ends, cumulative_distance
+    if len(points) >= 2 and expected_distance > calculated_length and (points[-1] == points[-2]).all():
+        return path, segment_ends, np.append(cumulative_distance, calculated_length)
+
+    cumulative_distance = cumulative_distance[:-1]
+    end = len(path) - 1
+    if calculated_length > expected_distance:
+        # Drop the points at the end that reach past the expected distance
+        shorter = np.flatnonzero(~(cumulative_distance >= expected_distance))
+        if len(shorter) == 0:
+            raise ValueError("calculate_length failed to calculate the slider path")
+        end = shorter[-1] + 1
+        cumulative_distance = cumulative_distance[:end]
+        path = path[:end+1]
+
+    if end <= 0:
+        return path, segment_ends, np.append(cumulative_distance, 0.0)
+
+    v1, v2 = path[end], path[end-1]
+    with np.errstate(all="ignore"):
+        direction = v1 - v2
+        direction /= _magnitude(direction[0], direction[1])
+        path[end] = direction * (expected_distance - cumulative_distance[-1]) + v2
+    return path, segment_ends, np.append(cumulative_distance, expected_distance)
+
+
+# batched path calculation
+
+def _approximate_segments(points, segment_offsets, curve_types, precision):
+    # Returns the approximated points of every segment
+    bezier_tolerance, catmull_detail, circular_arc_tolerance = precision
+    starts = segment_offsets[:-1]
+    lengths = np.diff(segment_offsets)
+    subpaths = [None] * len(starts)
+
+    linear = curve_types == CURVE_LINEAR
+    arcs = (curve_types == CURVE_PERFECT) & (lengths == 3)
+    # A catmull curve of 1 point gives no points, which falls back to bezier
+    catmulls = (curve_types == CURVE_CATMULL) & (lengths > 1)
+    beziers = ~(linear | arcs | catmulls)
+
+    for i in np.flatnonzero(linear):
+        subpaths[i] = points[starts[i]:starts[i]+lengths[i]]
+
+    if catmulls.any():
+        indices = np.flatnonzero(catmulls)
+        output, offsets = approximate_catmull_batch(points, starts[indices], lengths[indices], catmull_detail)
+        for i, subpath in zip(indices, _split(output, offsets)):
+            subpaths[i] = subpath
+
+    if arcs.any():
+        indices = np.flatnonzero(arcs)
+        curves = points[starts[indices][:, None] + np.arange(3)]
+        output, offsets, valid = approximate_circular_arc_batch(curves, circular_arc_tolerance)
+        for i, subpath in zip(indices[valid], _split(output, offsets[np.append(valid, True)])):
+            subpaths[i] = subpath
+        beziers[indices[~valid]] = True
+
+    for n in np.unique(lengths[beziers]):
+        indices = np.flatnonzero(beziers & (lengths == n))
+        curves = points[starts[indices][:, None] + np.arange(n)]
+        output, offsets = approximate_bezier_batch(curves, bezier_tolerance)
+        for i, subpath in zip(indices, _split(output, offsets)):
+            subpaths[i] = subpath
+
+    return subpaths
+
+
+def calculate_paths(points, segment_offsets, slider_offsets, curve_types, expected_distances, precision=None):
+    """
+    Same as sliderpath.calculate_paths. The segments of every slider are approximated
+    together, grouped by curve type and number of control points.
+    """
+    precision = _parse_precision(precision, "calculate_paths")
+    points = _as_points(points)
+    segment_offsets = np.asarray(segment_offsets, dtype=np.int64)
+    slider_offsets = np.asarray(slider_offsets, dtype=np.int64)
+    curve_types = np.asarray(curve_types, dtype=np.int64)
+    expected_distances = np.asarray(expected_distances, dtype=np.float64)
+
+    slider_count = len(curve_types)
+    segment_count = len(segment_offsets) - 1
+    valid = (
+        segment_count >= 0 and len(slider_offsets) == slider_count + 1 and
+        len(expected_distances) == slider_count and slider_offsets[0] == 0 and
+        slider_offsets[-1] == segment_count and segment_offsets[0] == 0 and
+        segment_offsets[-1] == len(points) and (np.diff(segment_offsets) > 0).all() and
+        (np.diff(slider_offsets) > 0).all()
+    )
+    if not valid:
+        raise ValueError("Invalid offsets given to calculate_paths")
+
+    segment_sliders = np.repeat(np.arange(slider_count), np.diff(slider_offsets))
+    subpaths = _approximate_segments(points, segment_offsets, curve_types[segment_sliders], precision)
+    subpath_lengths = np.array([len(subpath) for subpath in subpaths], dtype=np.int64)
+    path = np.concatenate(subpaths) if subpaths else np.zeros((0, 2))
+
+    # Drop points that are the same as the one before them to 5 decimals, except the
+    # first point of each slider
+    point_sliders = np.repeat(segment_sliders, subpath_lengths)
+    keys = np.rint(path * 1e5)
+    keep = np.ones(len(path), dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]).any(axis=1) | (point_sliders[1:] != point_sliders[:-1])
+    path = path[keep]
+    kept = np.append(0, np.cumsum(keep))
+    segment_point_ends = kept[np.cumsum(subpath_lengths)]
+    slider_point_offsets = np.append(0, segment_point_ends[slider_offsets[1:] - 1])
+    segment_ends = (segment_point_ends - slider_point_offsets[segment_sliders] - 1).astype(np.float64)
+
+    paths, distances = [], []
+    failed = np.zeros(slider_count, dtype=np.uint8)
+    for i in range(slider_count):
+        # The last segment ends with the last two control points
+        last_segment = slider_offsets[i+1] - 1
+        try:
+            slider_path, _, cumulative_distance = calculate_length(
+                points[segment_offsets[last_segment]:segment_offsets[last_segment+1]],
+                path[slider_point_offsets[i]:slider_point_offsets[i+1]], (), expected_distances[i])
+        except ValueError:
+            # Only this slider fails, it gets an empty path and NaN segment ends
+            failed[i] = 1
+            slider_path, cumulative_distance = np.zeros((0, 2)), np.zeros(0)
+            segment_ends[slider_offsets[i]:slider_offsets[i+1]] = np.nan
+        paths.append(slider_path)
+        distances.append(cumulative_distance)
+
+    def offsets(arrays):
+        return np.append(0, np.cumsum([len(array) for array in arrays], dtype=np.int64)).astype(np.int64)
+
+    return (
+        np.concatenate(paths) if paths else np.zeros((0, 2)), offsets(paths),
+        np.concatenate(distances) if distances else np.zeros(0), offsets(distances),
+        segment_ends, failed
+    )
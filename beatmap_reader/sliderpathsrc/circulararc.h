@@ -12,10 +12,9 @@ typedef struct {
     double thetaRange;
     double direction;
     float radius;
-    Vector2 *center;
+    Vector2 center;
 } CircularArcProperties;
 
-extern CircularArcProperties *carcprop_init(EfficientList *vPoints);
-extern void carcprop_free(CircularArcProperties *carc);
+extern void carcprop_init(CircularArcProperties *carc, Vector2 *points);
 
 #endif /* ~CIRCULARARC_H */
\ No newline at end of file
@@ -1,10 +1,24 @@
 #ifndef CONSTANTS_H
 #define CONSTANTS_H
 
+// Precision used when none is given
 #define BEZIER_TOLERANCE 0.25f
 #define CATMULL_DETAIL 50
 #define CIRCULAR_ARC_TOLERANCE 0.1f
 
+// Same fields as PathPrecision in path.py
+typedef struct {
+    float bezierTolerance;
+    int catmullDetail;
+    float circularArcTolerance;
+} PathPrecision;
+
+// Values of CurveType in enums.py
+#define CURVE_LINEAR 0
+#define CURVE_PERFECT 1
+#define CURVE_BEZIER 2
+#define CURVE_CATMULL 3
+
 #define FLOAT_EPSILON 1e-3f
 #define DOUBLE_EPSILON 1e-7
 
@@ -2,25 +2,26 @@
 #define LIST_H
 
 #include <stdbool.h>
+#include <stddef.h>
 
+// Growable array of items of one size stored back to back, the capacity doubles when it runs out
 typedef struct {
-    void *value;
-    size_t size;
-} ListValue;
-
-typedef struct {
-    ListValue **values;
+    void *values;
     size_t length;
+    size_t capacity;
+    size_t itemSize;
 } List;
 
-extern List* list_init();
-extern ListValue* list_create_value(void *value, size_t valueSize);
-extern bool list_append(List *l, void *value, size_t valueSize);
-extern bool list_insert(List *l, void *value, size_t valueSize, size_t index);
+extern List* list_init(size_t itemSize);
+extern bool list_reserve(List *l, size_t capacity);
+extern bool list_append(List *l, void *value);
+extern bool list_extend(List *l, void *values, size_t count);
+extern bool list_insert(List *l, void *value, size_t index);
 extern void* list_get(List *l, size_t index);
-extern bool list_set(List *l, size_t index, void *value, size_t valueSize);
+extern bool list_set(List *l, size_t index, void *value);
 extern bool list_remove(List *l, size_t index);
-extern void* list_pop(List *l, size_t index, size_t *sizeBuf);
+extern bool list_pop(List *l, size_t index, void *out);
+extern void list_clear(List *l);
 extern void list_free(List *l);
 
 
@@ -5,7 +5,9 @@
 #include "circulararc.h"
 #include "constants.h"
 #include "util.h"
+#include <math.h>
 #include <stdbool.h>
+#include <stdint.h>
 #include <stdlib.h>
 #include <string.h>
 
@@ -30,7 +32,7 @@ void print_efflist(EfficientList *list) {
 void print_list(List *list) {
     printf("[");
     for (size_t i=0; i<list->length; i++) {
-        print_efflist(list->values[i]->value);
+        print_vector(list_get(list, i));
         if (i != list->length-1) printf(", ");
     }
     printf("]");
@@ -39,233 +41,290 @@ void print_list(List *list) {
 
 // input output helping functions
 
+bool buffer_format_matches(Py_buffer *view, char format) {
+    // Unformatted and byte buffers are taken as raw values
+    const char *f = view->format;
+    if (f == NULL || strcmp(f, "B") == 0) {return true;}
+    if (*f == '<' || *f == '=' || *f == '@') {f++;}
+    if (f[0] != '\0' && f[1] == '\0') {
+        if (f[0] == format) {return true;}
+        // int64 is 'l' where long is 64 bits
+        if (format == 'q' && f[0] == 'l' && view->itemsize == 8) {return true;}
+    }
+    return false;
+}
+
+bool get_input_buffer(PyObject *obj, Py_buffer *view, size_t itemSize, char format, const char *name) {
+    if (PyObject_GetBuffer(obj, view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {bool_fail();}
+    if (!buffer_format_matches(view, format) || view->len % itemSize != 0) {
+        PyErr_Format(PyExc_ValueError, "%s must be a contiguous buffer of %s", name,
+            format == 'd' ? "float64" : "int64");
+        PyBuffer_Release(view);
+        bool_fail();
+    }
+    return true;
+}
+
 EfficientList *parse_points(PyObject *points) {
+    if (PyObject_CheckBuffer(points)) {
+        // Contiguous float64 (x, y) pairs, such as an (n, 2) numpy array
+        Py_buffer view;
+        if (!get_input_buffer(points, &view, sizeof(Vector2), 'd', "points")) {null_fail();}
+        EfficientList *vPoints = efflist_init(view.len / sizeof(Vector2), sizeof(Vector2));
+        if (vPoints == NULL) {PyBuffer_Release(&view);null_fail();}
+        memcpy(vPoints->values, view.buf, view.len);
+        PyBuffer_Release(&view);
+        return vPoints;
+    }
+
     EfficientList *vPoints = efflist_init(PyList_Size(points), sizeof(Vector2));
     if (vPoints == NULL) {null_fail();}
     for (size_t i=0; i<vPoints->length; i++) {
         PyObject *point = PyList_GetItem(points, i);
-        Vector2 *v = vector2_init(
-            PyFloat_AsDouble(PyTuple_GetItem(point, 0)),
-            PyFloat_AsDouble(PyTuple_GetItem(point, 1))
-        );
-        if (v == NULL) {null_fail();}
-        if (!efflist_set(vPoints, i, v)) {null_fail();}
+        Vector2 v;
+        v.x = PyFloat_AsDouble(PyTuple_GetItem(point, 0));
+        v.y = PyFloat_AsDouble(PyTuple_GetItem(point, 1));
+        if (!efflist_set(vPoints, i, &v)) {efflist_free(vPoints);null_fail();}
     }
 
     return vPoints;
 }
 
 List *parse_points_list(PyObject *points) {
-    List *vPoints = list_init();
+    EfficientList *vPoints = parse_points(points);
     if (vPoints == NULL) {null_fail();}
-    size_t vPointsSize = PyList_Size(points);
-    for (size_t i=0; i<vPointsSize; i++) {
-        PyObject *point = PyList_GetItem(points, i);
-        Vector2 v;
-        v.x = PyFloat_AsDouble(PyTuple_GetItem(point, 0));
-        v.y = PyFloat_AsDouble(PyTuple_GetItem(point, 1));
-        if (!list_append(vPoints, &v, sizeof(Vector2))) {null_fail();}
+    List *list = list_init(sizeof(Vector2));
+    if (list == NULL || !list_extend(list, vPoints->values, vPoints->length)) {
+        if (list != NULL) {list_free(list);}
+        efflist_free(vPoints);
+        null_fail();
     }
+    efflist_free(vPoints);
+    return list;
+}
 
-    return vPoints;
+EfficientList *parse_doubles(PyObject *values, const char *name) {
+    if (PyObject_CheckBuffer(values)) {
+        Py_buffer view;
+        if (!get_input_buffer(values, &view, sizeof(double), 'd', name)) {null_fail();}
+        EfficientList *list = efflist_init(view.len / sizeof(double), sizeof(double));
+        if (list == NULL) {PyBuffer_Release(&view);null_fail();}
+        memcpy(list->values, view.buf, view.len);
+        PyBuffer_Release(&view);
+        return list;
+    }
+
+    EfficientList *list = efflist_init(PyList_Size(values), sizeof(double));
+    if (list == NULL) {null_fail();}
+    for (size_t i=0; i<list->length; i++) {
+        double num = PyFloat_AsDouble(PyList_GetItem(values, i));
+        if (!efflist_set(list, i, &num)) {efflist_free(list);null_fail();}
+    }
+    return list;
 }
 
-EfficientList *parse_args(PyObject *args, const char *func_name) {
+bool parse_precision(PyObject *rawPrecision, PathPrecision *precision, const char *func_name) {
+    // Takes a PathPrecision tuple, or None for the defaults in constants.h
+    precision->bezierTolerance = BEZIER_TOLERANCE;
+    precision->catmullDetail = CATMULL_DETAIL;
+    precision->circularArcTolerance = CIRCULAR_ARC_TOLERANCE;
+    if (rawPrecision == NULL || rawPrecision == Py_None) {return true;}
+
+    if (!PyTuple_Check(rawPrecision) || !PyArg_ParseTuple(rawPrecision, "fif", &precision->bezierTolerance,
+        &precision->catmullDetail, &precision->circularArcTolerance)) {
+        PyErr_Format(PyExc_TypeError,
+            "precision given to %s must be a (bezier_tolerance, catmull_detail, circular_arc_tolerance) tuple",
+            func_name);
+        bool_fail();
+    }
+    if (!(precision->bezierTolerance > 0) || precision->catmullDetail <= 0 ||
+        !(precision->circularArcTolerance > 0)) {
+        PyErr_Format(PyExc_ValueError, "Invalid precision given to %s", func_name);
+        bool_fail();
+    }
+    return true;
+}
+
+EfficientList *parse_args(PyObject *args, const char *func_name, PathPrecision *precision) {
     PyObject *rawPoints;
+    PyObject *rawPrecision = NULL;
     char fmt[100];
-    sprintf(fmt, "O:%s\0", func_name);
+    sprintf(fmt, "O|O:%s\0", func_name);
 
-    if (!PyArg_ParseTuple(args, fmt, &rawPoints)) {
+    if (!PyArg_ParseTuple(args, fmt, &rawPoints, &rawPrecision)) {
         null_fail();
     }
+    if (!parse_precision(rawPrecision, precision, func_name)) {null_fail();}
 
     return parse_points(rawPoints);
 }
 
-PyObject *vector2_list_to_pylist(List *list) {
-    PyObject *pyOutput = PyList_New(list->length);
-    for (size_t i=0; i<list->length; i++) {
-        Vector2 *point = list->values[i]->value;
-        PyList_SetItem(pyOutput, i, PyTuple_Pack(2, PyFloat_FromDouble(point->x), 
-            PyFloat_FromDouble(point->y)));
+PyObject *list_to_bytes(List *list) {
+    // Copies the values of a list into a bytes object, which numpy can wrap without copying
+    return PyBytes_FromStringAndSize(list->values, list->length * list->itemSize);
+}
+
+PyObject *calculation_failed(const char *func_name) {
+    // The core functions run without the GIL so they can't raise, the error is set here instead
+    if (!PyErr_Occurred()) {
+        PyErr_Format(PyExc_ValueError, "%s failed to calculate the slider path", func_name);
     }
-    return pyOutput;
+    return NULL;
 }
 
 
 // bezier functions
 
-char bezier_is_flat_enough(EfficientList *points) {
-    for (size_t i=1; i<points->length-1; i++) {
-        Vector2 *point1 = efflist_get(points, i-1);
-        Vector2 *point2 = efflist_get(points, i);
-        Vector2 *point3 = efflist_get(points, i+1);
-        if (point1 == NULL || point2 == NULL || point3 == NULL) {fail();return 2;}
-        Vector2 *calcPoint = vector2_init(point1->x-2*point2->x+point3->x, point1->y-2*point2->y+point3->y);
-        if (calcPoint == NULL) {fail();return 2;}
-        if (pow(vector2_magnitude(calcPoint), 2) > BEZIER_TOLERANCE * BEZIER_TOLERANCE * 4) {
-            return 0;
-        }
-        free(calcPoint);
+// Scratch space for flattening bezier curves, reused across segments and sliders so
+// that calculating a path doesn't allocate once it has grown to the largest curve
+typedef struct {
+    size_t size;
+    List *stack;
+    Vector2 *midpoints;
+    Vector2 *left;
+    Vector2 *right;
+    Vector2 *joined;
+} BezierBuffers;
+
+bool bezier_buffers_prepare(BezierBuffers *buffers, size_t nPoints) {
+    if (buffers->stack == NULL) {
+        buffers->stack = list_init(sizeof(Vector2));
+        if (buffers->stack == NULL) {bool_fail();}
     }
-    return 1;
+    list_clear(buffers->stack);
+    if (nPoints <= buffers->size) {return true;}
+
+    // left and joined are one allocation since joined starts with the left half
+    Vector2 *midpoints = realloc(buffers->midpoints, nPoints * sizeof(Vector2));
+    if (midpoints == NULL) {bool_fail();}
+    buffers->midpoints = midpoints;
+    Vector2 *right = realloc(buffers->right, nPoints * sizeof(Vector2));
+    if (right == NULL) {bool_fail();}
+    buffers->right = right;
+    Vector2 *joined = realloc(buffers->joined, (nPoints * 2 - 1) * sizeof(Vector2));
+    if (joined == NULL) {bool_fail();}
+    buffers->joined = joined;
+    buffers->left = joined;
+    buffers->size = nPoints;
+    return true;
 }
 
-bool bezier_subdivide(EfficientList *points, EfficientList *l, EfficientList *r, 
-EfficientList *subdivisionBuffer, size_t count) {
-    size_t bufLength = subdivisionBuffer->length;
-    EfficientList *midPoints = efflist_init(bufLength, subdivisionBuffer->itemSize);
-    if (midPoints == NULL) {bool_fail();} 
+void bezier_buffers_free(BezierBuffers *buffers) {
+    if (buffers->stack != NULL) {list_free(buffers->stack);}
+    free(buffers->midpoints);
+    free(buffers->right);
+    free(buffers->joined);
+}
 
-    for (size_t i=0; i<max(bufLength, count); i++) {
-        Vector2 *v = efflist_get(i<count ? points : subdivisionBuffer, i);
-        if (v == NULL) {bool_fail();}
-        if (!efflist_set(midPoints, i, v)) {bool_fail();}
+bool bezier_is_flat_enough(Vector2 *points, size_t nPoints, float tolerance) {
+    for (size_t i=1; i+1<nPoints; i++) {
+        Vector2 *point1 = &points[i-1];
+        Vector2 *point2 = &points[i];
+        Vector2 *point3 = &points[i+1];
+        Vector2 calcPoint = {point1->x-2*point2->x+point3->x, point1->y-2*point2->y+point3->y};
+        if (pow(vector2_magnitude(&calcPoint), 2) > tolerance * tolerance * 4) {
+            return false;
+        }
     }
+    return true;
+}
+
+void bezier_subdivide(Vector2 *points, Vector2 *l, Vector2 *r, Vector2 *midPoints, size_t count) {
+    memcpy(midPoints, points, count * sizeof(Vector2));
 
     for (size_t i=0; i<count; i++) {
-        Vector2 *v1 = efflist_get(midPoints, 0);
-        Vector2 *v2 = efflist_get(midPoints, count-i-1);
-        if (v1 == NULL || v2 == NULL) {bool_fail();}
-        if (!efflist_set(l, i, v1)) {bool_fail();}
-        if (!efflist_set(r, count-i-1, v2)) {bool_fail();}
+        l[i] = midPoints[0];
+        r[count-i-1] = midPoints[count-i-1];
 
         for (size_t j=0; j<count-i-1; j++) {
-            Vector2 *v1 = efflist_get(midPoints, j);
-            Vector2 *v2 = efflist_get(midPoints, j+1);
-            if (v1 == NULL || v2 == NULL) {bool_fail();}
-            v1->x = (v1->x+v2->x)/2;
-            v1->y = (v1->y+v2->y)/2;
+            midPoints[j].x = (midPoints[j].x+midPoints[j+1].x)/2;
+            midPoints[j].y = (midPoints[j].y+midPoints[j+1].y)/2;
         }
     }
-
-    efflist_free(midPoints);
-    return true;
 }
 
-bool bezier_approximate(EfficientList *points, List *output, EfficientList *subdivisionBuffer1, 
-EfficientList *subdivisionBuffer2, size_t count) {
-    EfficientList *l = efflist_init(subdivisionBuffer2->length, subdivisionBuffer2->itemSize);
-    EfficientList *r = efflist_init(subdivisionBuffer1->length,  subdivisionBuffer1->itemSize);
-    if (l == NULL || r == NULL) {bool_fail();}
-    size_t bufSize1 = subdivisionBuffer1->itemSize*subdivisionBuffer1->length;
-    size_t bufSize2 = subdivisionBuffer2->itemSize*subdivisionBuffer2->length;
-    errno_t s1 = memcpy_s(l->values, bufSize2, subdivisionBuffer2->values, bufSize2);
-    errno_t s2 = memcpy_s(r->values, bufSize1, subdivisionBuffer1->values, bufSize1);
-    if (s1 != 0 || s2 != 0) {
-        PyErr_SetString(PyExc_MemoryError, "Failed to copy values to l->values and/or r->values due to memcpy_s failing");
-        bool_fail();
-    }
-    
-    if (!bezier_subdivide(points, l, r, subdivisionBuffer1, count)) {bool_fail();}
+bool bezier_approximate(Vector2 *points, List *output, BezierBuffers *buffers, size_t count) {
+    Vector2 *l = buffers->joined;
+    Vector2 *r = buffers->right;
+    bezier_subdivide(points, l, r, buffers->midpoints, count);
 
     for (size_t i=0; i<count-1; ++i) {
-        Vector2 *v = efflist_get(r, i+1);
-        if (v == NULL) {bool_fail();}
-        if (!efflist_set(l, count+i, v)) {bool_fail();}
+        l[count+i] = r[i+1];
     }
 
-    Vector2 *firstPoint = efflist_get(points, 0);
-    if (firstPoint == NULL) {bool_fail();}
-    if (!list_append(output, firstPoint, sizeof *firstPoint)) {bool_fail();}
+    if (!list_reserve(output, output->length + count)) {bool_fail();}
+    if (!list_append(output, &points[0])) {bool_fail();}
 
-    for (size_t i=1; i<count-1; ++i) {
+    for (size_t i=1; i+1<count; ++i) {
         size_t index = 2 * i;
-        Vector2 *p1 = efflist_get(l, index-1);
-        Vector2 *p2 = efflist_get(l, index);
-        Vector2 *p3 = efflist_get(l, index+1);
-        if (p1 == NULL || p2 == NULL || p3 == NULL) {bool_fail();}
-        Vector2 *p = vector2_init(
+        Vector2 *p1 = &l[index-1];
+        Vector2 *p2 = &l[index];
+        Vector2 *p3 = &l[index+1];
+        Vector2 p = {
             0.25f * (p1->x + 2 * p2->x + p3->x),
             0.25f * (p1->y + 2 * p2->y + p3->y)
-        );
-        if (p == NULL) {bool_fail();}
-        if (!list_append(output, p, sizeof *p)) {bool_fail();}
-        free(p);
+        };
+        if (!list_append(output, &p)) {bool_fail();}
     }
-
-    efflist_free(l);
-    efflist_free(r);
     return true;
 }
 
-static PyObject *sliderpath_approximate_bezier(PyObject *self, PyObject *args) {
-    EfficientList *vPoints = parse_args(args, "approximate_bezier");
-    if (vPoints == NULL) {null_fail();}
-    size_t nPoints = vPoints->length;
-
-    if (nPoints <= 0) {
-        PyErr_SetString(PyExc_ValueError, "The list given to bezier calculate has 1 or less points");
-        null_fail();
-    }
-
-    List *output = list_init();
-    if (output == NULL) {null_fail();}
-
-    List *toFlatten = list_init();
-    if (toFlatten == NULL) {null_fail();}
+bool bezier_core(Vector2 *points, size_t nPoints, List *output, BezierBuffers *buffers, PathPrecision *precision) {
+    if (nPoints == 0) {bool_fail();}
+    if (!bezier_buffers_prepare(buffers, nPoints)) {bool_fail();}
 
-    EfficientList *copyPoints = efflist_init(vPoints->length, vPoints->itemSize);
-    size_t size = vPoints->length*vPoints->itemSize;
-    if (memcpy_s(copyPoints->values, size, vPoints->values, size) != 0) {null_fail();}
-
-    if (!list_insert(toFlatten, copyPoints, sizeof *copyPoints, 0)) {null_fail();} 
-    free(copyPoints);
-    List *freeBuffers = list_init();
-    if (freeBuffers == NULL) {null_fail();}
-
-    EfficientList *subdivisionBuffer1 = efflist_init(nPoints, sizeof(Vector2));
-    EfficientList *subdivisionBuffer2 = efflist_init(nPoints * 2 - 1, sizeof(Vector2));
-    EfficientList *leftChild = efflist_init(subdivisionBuffer2->length, sizeof(Vector2));
-    if (subdivisionBuffer1 == NULL || subdivisionBuffer2 == NULL || leftChild == NULL) {null_fail();}
+    // Curves waiting to be flattened, nPoints each, with the next one on top
+    List *toFlatten = buffers->stack;
+    if (!list_extend(toFlatten, points, nPoints)) {bool_fail();}
 
     while (toFlatten->length > 0) {
-        EfficientList *parent = list_pop(toFlatten, 0, NULL);
-        if (parent == NULL) {null_fail();}
+        Vector2 *parent = (Vector2*)toFlatten->values + toFlatten->length - nPoints;
 
-        char isFlat = bezier_is_flat_enough(parent);
-        if (isFlat == 2) {null_fail();}
-        if (isFlat) {
-            if (!bezier_approximate(parent, output, subdivisionBuffer1, subdivisionBuffer2, 
-                nPoints)) {null_fail();}
-
-            if (!list_insert(freeBuffers, parent, sizeof *parent, 0)) {null_fail();}
-            free(parent);
+        if (bezier_is_flat_enough(parent, nPoints, precision->bezierTolerance)) {
+            if (!bezier_approximate(parent, output, buffers, nPoints)) {bool_fail();}
+            toFlatten->length -= nPoints;
             continue;
         }
 
-        EfficientList *rightChild = freeBuffers->length > 0 ? 
-            list_pop(freeBuffers, 0, NULL) : 
-            efflist_init(nPoints, sizeof(Vector2));
-        if (rightChild == NULL) {null_fail();}
-        
-        if (!bezier_subdivide(parent, leftChild, rightChild, subdivisionBuffer1, 
-            nPoints)) {null_fail();}
-
-        for (size_t i=0; i<nPoints; ++i) {
-            Vector2 *v = efflist_get(leftChild, i);
-            if (v == NULL) {null_fail();}
-            if (!efflist_set(parent, i, v)) {null_fail();}
-        }
+        // The parent is replaced by its right half and the left half goes on top,
+        // so the curve is still flattened from start to end
+        bezier_subdivide(parent, buffers->left, buffers->right, buffers->midpoints, nPoints);
+        memcpy(parent, buffers->right, nPoints * sizeof(Vector2));
+        if (!list_extend(toFlatten, buffers->left, nPoints)) {bool_fail();}
+    }
+
+    if (!list_append(output, &points[nPoints-1])) {bool_fail();}
+    return true;
+}
 
-        if (!list_insert(toFlatten, rightChild, sizeof *rightChild, 0)) {null_fail();}
-        if (!list_insert(toFlatten, parent, sizeof *parent, 0)) {null_fail();}
-        free(rightChild);
-        free(parent);
+static PyObject *sliderpath_approximate_bezier(PyObject *self, PyObject *args) {
+    PathPrecision precision;
+    EfficientList *vPoints = parse_args(args, "approximate_bezier", &precision);
+    if (vPoints == NULL) {null_fail();}
+
+    PyObject *pyOutput = NULL;
+    List *output = NULL;
+    if (vPoints->length <= 0) {
+        PyErr_SetString(PyExc_ValueError, "The list given to bezier calculate has 1 or less points");
+        fail();
+        goto release;
     }
-    
-    Vector2 *lastPoint = efflist_get(vPoints, nPoints-1);
-    if (lastPoint == NULL || !list_append(output, lastPoint, sizeof *lastPoint)) {null_fail();}
-    PyObject *pyOutput = vector2_list_to_pylist(output);
 
-    // TODO: make sure this frees up all values to avoid memory leak
-    list_free(output);
+    output = list_init(sizeof(Vector2));
+    if (output == NULL) {PyErr_NoMemory();fail();goto release;}
+    BezierBuffers buffers = {0};
+    bool success;
+    Py_BEGIN_ALLOW_THREADS
+    success = bezier_core(vPoints->values, vPoints->length, output, &buffers, &precision);
+    Py_END_ALLOW_THREADS
+    bezier_buffers_free(&buffers);
+    if (!success) {fail();calculation_failed("approximate_bezier");goto release;}
+
+    pyOutput = list_to_bytes(output);
+
+release:
+    if (output != NULL) {list_free(output);}
     efflist_free(vPoints);
-    efflist_free(subdivisionBuffer1);
-    efflist_free(subdivisionBuffer2);
-    efflist_free(leftChild);
-    free(toFlatten);
-    free(freeBuffers);
     return pyOutput;
 }
 
@@ -276,218 +335,403 @@ double catmull_calc_point(double n1, double n2, double n3, double n4, double t,
     return 0.5f * (2.0f * n2 + (-n1 + n3) * t + (2.0f * n1 - 5.0f * n2 + 4.0f * n3 - n4) * t2 + (-n1 + 3.0f * n2 - 3.0f * n3 + n4) * t3);
 }
 
-Vector2 *catmull_find_point(Vector2 *v1, Vector2 *v2, Vector2 *v3, Vector2 *v4, double t) {
+Vector2 catmull_find_point(Vector2 *v1, Vector2 *v2, Vector2 *v3, Vector2 *v4, double t) {
     double t2 = t * t;
     double t3 = t * t2;
 
-    Vector2 *result = vector2_init(
+    Vector2 result = {
         catmull_calc_point(v1->x, v2->x, v3->x, v4->x, t, t2, t3),
         catmull_calc_point(v1->y, v2->y, v3->y, v4->y, t, t2, t3)
-    );
-    if (result == NULL) {null_fail();}
+    };
     return result;
 }
 
+bool catmull_core(Vector2 *points, size_t nPoints, List *result, PathPrecision *precision) {
+    if (nPoints == 0) {bool_fail();}
+    int detail = precision->catmullDetail;
+    if (!list_reserve(result, result->length + (nPoints - 1) * detail * 2)) {bool_fail();}
+
+    for (size_t i=0; i+1<nPoints; i++) {
+        Vector2 *v1 = &points[i > 0 ? (i-1) : i];
+        Vector2 *v2 = &points[i];
+        Vector2 v3 = points[i + 1];
+        Vector2 v4 = i + 2 < nPoints ?
+            points[i + 2] :
+            (Vector2){v3.x * 2 - v2->x, v3.y * 2 - v2->y};
+
+        for (int c = 0; c < detail; c++) {
+            Vector2 p1 = catmull_find_point(v1, v2, &v3, &v4, (double)c / detail);
+            Vector2 p2 = catmull_find_point(v1, v2, &v3, &v4, (double)(c+1) / detail);
+            if (!list_append(result, &p1)) {bool_fail();}
+            if (!list_append(result, &p2)) {bool_fail();}
+        }
+    }
+    return true;
+}
+
 static PyObject *sliderpath_approximate_catmull(PyObject *self, PyObject *args) {
-    EfficientList *vPoints = parse_args(args, "approximate_catmull");
+    PathPrecision precision;
+    EfficientList *vPoints = parse_args(args, "approximate_catmull", &precision);
     if (vPoints == NULL) {null_fail();}
 
-    List *result = list_init();
-    if (result == NULL) {null_fail();}
-
-    for (size_t i=0; i<vPoints->length-1; i++) {
-        Vector2 *v1 = efflist_get(vPoints, i > 0 ? (i-1) : i);
-        Vector2 *v2 = efflist_get(vPoints, i);
-        if (v1 == NULL || v2 == NULL) {null_fail();}
-        Vector2 *v3 = i < vPoints->length - 1 ? 
-            efflist_get(vPoints, i + 1) : 
-            vector2_init(v2->x * 2 - v1->x, v2->y * 2 - v1->y);
-        if (v3 == NULL) {null_fail();}
-        Vector2 *v4 = i < vPoints->length - 2 ? 
-            efflist_get(vPoints, i + 2) : 
-            vector2_init(v3->x * 2 - v2->x, v3->y * 2 - v2->y);
-        if (v4 == NULL) {null_fail();}
-
-        for (int c = 0; c < CATMULL_DETAIL; c++) {
-            Vector2 *p1 = catmull_find_point(v1, v2, v3, v4, (double)c / CATMULL_DETAIL);
-            Vector2 *p2 = catmull_find_point(v1, v2, v3, v4, (double)(c+1) / CATMULL_DETAIL);
-            if (p1 == NULL || p2 == NULL) {null_fail();}
-            if (!list_append(result, p1, sizeof *p1)) {null_fail();}
-            if (!list_append(result, p2, sizeof *p2)) {null_fail();}
-            free(p1);
-            free(p2);
-        }
-        if (!efflist_contains_address(vPoints, v3)) free(v3);
-        if (!efflist_contains_address(vPoints, v4)) free(v4);
-    }
+    PyObject *output = NULL;
+    List *result = list_init(sizeof(Vector2));
+    if (result == NULL) {PyErr_NoMemory();fail();goto release;}
+    bool success;
+    Py_BEGIN_ALLOW_THREADS
+    success = catmull_core(vPoints->values, vPoints->length, result, &precision);
+    Py_END_ALLOW_THREADS
+    if (!success) {fail();calculation_failed("approximate_catmull");goto release;}
 
-    PyObject *output = vector2_list_to_pylist(result);
+    output = list_to_bytes(result);
+
+release:
+    if (result != NULL) {list_free(result);}
     efflist_free(vPoints);
-    list_free(result);
     return output;
 }
 
 
-static PyObject *sliderpath_approximate_circular_arc(PyObject *self, PyObject *args) {
-    EfficientList *vPoints = parse_args(args, "approximate_circular_arc");
-    if (vPoints == NULL) {null_fail();}
+// circular arc functions
 
-    CircularArcProperties *pr = carcprop_init(vPoints);
-    if (pr == NULL) {null_fail();}
-    
-    if (!pr->isValid) {
-        efflist_free(vPoints);
-        return sliderpath_approximate_bezier(self, args);
-    }
+bool circular_arc_core(Vector2 *points, size_t nPoints, List *output, BezierBuffers *buffers,
+PathPrecision *precision) {
+    if (nPoints < 3) {bool_fail();}
+    CircularArcProperties pr;
+    carcprop_init(&pr, points);
 
-    size_t nPoints = 2 * pr->radius <= CIRCULAR_ARC_TOLERANCE ? 2 : \
-        max(2, (int)ceil(pr->thetaRange / (2 * acos(1 - CIRCULAR_ARC_TOLERANCE / pr->radius))));
-
-    List *output = list_init();
-    if (output == NULL) {null_fail();}
+    if (!pr.isValid) {
+        return bezier_core(points, nPoints, output, buffers, precision);
+    }
 
-    for (size_t i=0; i<nPoints; ++i) {
-        double fract = (double)i / (nPoints - 1);
-        double theta = pr->thetaStart + pr->direction * fract * pr->thetaRange;
-        Vector2 *o = vector2_init(
-            (float)cos(theta) * pr->radius + pr->center->x,
-            (float)sin(theta) * pr->radius + pr->center->y
-        );
-        if (o == NULL) {null_fail();}
-        if (!list_append(output, o, sizeof *o)) {null_fail();}
-        free(o);
+    float tolerance = precision->circularArcTolerance;
+    size_t arcPoints = 2 * pr.radius <= tolerance ? 2 : \
+        MAX(2, (int)ceil(pr.thetaRange / (2 * acos(1 - tolerance / pr.radius))));
+    if (!list_reserve(output, output->length + arcPoints)) {bool_fail();}
+
+    for (size_t i=0; i<arcPoints; ++i) {
+        double fract = (double)i / (arcPoints - 1);
+        double theta = pr.thetaStart + pr.direction * fract * pr.thetaRange;
+        Vector2 o = {
+            (float)cos(theta) * pr.radius + pr.center.x,
+            (float)sin(theta) * pr.radius + pr.center.y
+        };
+        if (!list_append(output, &o)) {bool_fail();}
     }
+    return true;
+}
 
-    PyObject *pyOutput = vector2_list_to_pylist(output);
+static PyObject *sliderpath_approximate_circular_arc(PyObject *self, PyObject *args) {
+    PathPrecision precision;
+    EfficientList *vPoints = parse_args(args, "approximate_circular_arc", &precision);
+    if (vPoints == NULL) {null_fail();}
+
+    PyObject *pyOutput = NULL;
+    List *output = list_init(sizeof(Vector2));
+    if (output == NULL) {PyErr_NoMemory();fail();goto release;}
+    BezierBuffers buffers = {0};
+    bool success;
+    Py_BEGIN_ALLOW_THREADS
+    success = circular_arc_core(vPoints->values, vPoints->length, output, &buffers, &precision);
+    Py_END_ALLOW_THREADS
+    bezier_buffers_free(&buffers);
+    if (!success) {fail();calculation_failed("approximate_circular_arc");goto release;}
+
+    pyOutput = list_to_bytes(output);
+
+release:
+    if (output != NULL) {list_free(output);}
     efflist_free(vPoints);
-    carcprop_free(pr);
-    list_free(output);
     return pyOutput;
 }
 
 
 // other slider path calculation functions
 
+bool length_core(Vector2 *points, size_t nPoints, List *path, List *cumulativeLength, double expectedDistance) {
+    // Segment ends aren't adjusted when the path is cut short
+    if (path->length == 0) {bool_fail();}
+    Vector2 *pathPoints = path->values;
+    if (!list_reserve(cumulativeLength, cumulativeLength->length + path->length + 1)) {bool_fail();}
+
+    double calculatedLength = 0;
+    if (!list_append(cumulativeLength, &calculatedLength)) {bool_fail();}
+
+    for (size_t i=0; i<path->length-1; i++) {
+        Vector2 diff = {pathPoints[i+1].x - pathPoints[i].x, pathPoints[i+1].y - pathPoints[i].y};
+        calculatedLength += vector2_magnitude(&diff);
+        if (!list_append(cumulativeLength, &calculatedLength)) {bool_fail();}
+    }
+
+    if (expectedDistance == calculatedLength) {return true;}
+
+    if (nPoints >= 2 && expectedDistance > calculatedLength) {
+        if (vector2_equal(&points[nPoints-1], &points[nPoints-2])) {
+            return list_append(cumulativeLength, &calculatedLength);
+        }
+    }
+
+    cumulativeLength->length--;
+    double *lengths = cumulativeLength->values;
+    size_t pathEndIndex = path->length - 1;
+
+    if (calculatedLength > expectedDistance) {
+        if (cumulativeLength->length == 0) {bool_fail();}
+        while (lengths[cumulativeLength->length-1] >= expectedDistance) {
+            cumulativeLength->length--;
+            path->length--;
+            pathEndIndex--;
+            // Nothing left that's shorter than the expected distance
+            if (cumulativeLength->length == 0) {bool_fail();}
+        }
+    }
+
+    if (pathEndIndex <= 0) {
+        double zero = 0;
+        return list_append(cumulativeLength, &zero);
+    }
+
+    Vector2 *v1 = &pathPoints[pathEndIndex];
+    Vector2 *v2 = &pathPoints[pathEndIndex-1];
+    Vector2 dir = {v1->x - v2->x, v1->y - v2->y};
+    vector2_normalize(&dir);
+
+    double lastLength = lengths[cumulativeLength->length-1];
+    dir.x *= expectedDistance - lastLength;
+    dir.x += v2->x;
+    dir.y *= expectedDistance - lastLength;
+    dir.y += v2->y;
+
+    pathPoints[pathEndIndex] = dir;
+    return list_append(cumulativeLength, &expectedDistance);
+}
+
 static PyObject *sliderpath_calculate_length(PyObject *self, PyObject *args) {
     PyObject *rawPoints;
     PyObject *rawPath;
     PyObject *pySegmentEnds;
     double expectedDistance;
 
-    if (!PyArg_ParseTuple(args, "OOOd:calculate_length", &rawPoints, &rawPath, &pySegmentEnds, 
+    if (!PyArg_ParseTuple(args, "OOOd:calculate_length", &rawPoints, &rawPath, &pySegmentEnds,
         &expectedDistance)) {
         null_fail();
     }
 
+    PyObject *output = NULL;
+    List *cumulativeLength = NULL;
     List *path = parse_points_list(rawPath);
-    EfficientList *points = parse_points(rawPoints);
-    EfficientList *segmentEnds = efflist_init(PyList_Size(pySegmentEnds), sizeof(double));
-    if (path == NULL || points == NULL || segmentEnds == NULL) {null_fail();}
-    for (size_t i=0; i<segmentEnds->length; i++) {
-        double num = PyFloat_AsDouble(PyList_GetItem(pySegmentEnds, i));
-        if (!efflist_set(segmentEnds, i, &num)) {null_fail();}
-    }
+    EfficientList *points = path != NULL ? parse_points(rawPoints) : NULL;
+    EfficientList *segmentEnds = points != NULL ? parse_doubles(pySegmentEnds, "segment_ends") : NULL;
+    if (segmentEnds == NULL) {fail();goto release;}
+
+    cumulativeLength = list_init(sizeof(double));
+    if (cumulativeLength == NULL) {PyErr_NoMemory();fail();goto release;}
+    bool success;
+    Py_BEGIN_ALLOW_THREADS
+    success = length_core(points->values, points->length, path, cumulativeLength, expectedDistance);
+    Py_END_ALLOW_THREADS
+    if (!success) {fail();calculation_failed("calculate_length");goto release;}
+
+    // N steals the references, and Py_BuildValue drops them if one of them is NULL
+    output = Py_BuildValue("(NNN)", list_to_bytes(path),
+        PyBytes_FromStringAndSize(segmentEnds->values, segmentEnds->length * sizeof(double)),
+        list_to_bytes(cumulativeLength));
+
+release:
+    if (path != NULL) {list_free(path);}
+    if (points != NULL) {efflist_free(points);}
+    if (segmentEnds != NULL) {efflist_free(segmentEnds);}
+    if (cumulativeLength != NULL) {list_free(cumulativeLength);}
+    return output;
+}
 
-    double calculatedLength = 0;
-    List *cumulativeLength = list_init();
-    if (cumulativeLength == NULL) {null_fail();}
-    if (!list_append(cumulativeLength, &calculatedLength, sizeof calculatedLength)) {null_fail();}
 
-    for (size_t i=0; i<path->length-1; i++) {
-        Vector2 *p1 = list_get(path, i+1);
-        Vector2 *p2 = list_get(path, i);
-        Vector2 *diff = vector2_init(p1->x - p2->x, p1->y - p2->y);
-        if (diff == NULL) {null_fail();}
-        calculatedLength += vector2_magnitude(diff);
-        if (!list_append(cumulativeLength, &calculatedLength, sizeof calculatedLength)) {null_fail();}
-        free(diff);
-    }
-
-    if (expectedDistance != calculatedLength) {
-        if (points->length >= 2 && expectedDistance > calculatedLength) {
-            Vector2 *lastPoint = efflist_get(points, points->length-1);
-            Vector2 *secondLastPoint = efflist_get(points, points->length-2);
-            if (lastPoint == NULL || secondLastPoint == NULL) {null_fail();}
-            if (vector2_equal(lastPoint, secondLastPoint)) {
-                list_append(cumulativeLength, &calculatedLength, sizeof calculatedLength);
-                goto return_values;
+// batched path calculation
+
+// Working lists of calculate_path_core, reused for every slider
+typedef struct {
+    List *subpath;
+    List *path;
+    List *cumulativeLength;
+    BezierBuffers bezier;
+} PathBuffers;
+
+bool same_point(Vector2 *v1, Vector2 *v2) {
+    // Points are compared rounded to 5 decimals, like SliderPath.compare_points
+    return nearbyint(v1->x * 1e5) == nearbyint(v2->x * 1e5) && nearbyint(v1->y * 1e5) == nearbyint(v2->y * 1e5);
+}
+
+bool calculate_path_core(Vector2 *points, int64_t *segmentOffsets, size_t segmentCount, int64_t curveType,
+double expectedDistance, PathPrecision *precision, PathBuffers *buffers, List *pathOut, List *distanceOut,
+List *segmentEndOut) {
+    List *subpath = buffers->subpath;
+    List *path = buffers->path;
+    List *cumulativeLength = buffers->cumulativeLength;
+    list_clear(path);
+    list_clear(cumulativeLength);
+    Vector2 *segment = NULL;
+    size_t segmentLength = 0;
+
+    for (size_t i=0; i<segmentCount; i++) {
+        segment = points + segmentOffsets[i];
+        segmentLength = (size_t)(segmentOffsets[i+1] - segmentOffsets[i]);
+
+        list_clear(subpath);
+        bool success;
+        if (curveType == CURVE_LINEAR) {
+            success = list_extend(subpath, segment, segmentLength);
+        } else if (curveType == CURVE_PERFECT && segmentLength == 3) {
+            success = circular_arc_core(segment, segmentLength, subpath, &buffers->bezier, precision);
+        } else if (curveType == CURVE_CATMULL) {
+            success = catmull_core(segment, segmentLength, subpath, precision);
+        } else {
+            success = bezier_core(segment, segmentLength, subpath, &buffers->bezier, precision);
+        }
+        if (success && subpath->length == 0) {
+            success = bezier_core(segment, segmentLength, subpath, &buffers->bezier, precision);
+        }
+        if (!success) {bool_fail();}
+
+        if (!list_reserve(path, path->length + subpath->length)) {bool_fail();}
+        Vector2 *subpathPoints = subpath->values;
+        for (size_t j=0; j<subpath->length; j++) {
+            Vector2 *point = &subpathPoints[j];
+            if (path->length == 0 || !same_point((Vector2*)path->values + path->length - 1, point)) {
+                if (!list_append(path, point)) {bool_fail();}
             }
         }
 
-        if (!list_remove(cumulativeLength, cumulativeLength->length-1)) {null_fail();}
+        double segmentEnd = (double)path->length - 1;
+        if (!list_append(segmentEndOut, &segmentEnd)) {bool_fail();}
+    }
 
-        size_t pathEndIndex = path->length - 1;
+    // The last segment ends with the last two control points
+    if (!length_core(segment, segmentLength, path, cumulativeLength, expectedDistance)) {bool_fail();}
 
-        if (calculatedLength > expectedDistance) {
-            double *lastLength = list_get(cumulativeLength, cumulativeLength->length-1);
-            if (lastLength == NULL) {null_fail();}
-            while (cumulativeLength->length > 0 && *lastLength >= expectedDistance) {
-                if (!list_remove(cumulativeLength, cumulativeLength->length-1)) {null_fail();}
-                if (!list_remove(path, pathEndIndex--)) {null_fail();}
+    if (!list_extend(pathOut, path->values, path->length)) {bool_fail();}
+    if (!list_extend(distanceOut, cumulativeLength->values, cumulativeLength->length)) {bool_fail();}
+    return true;
+}
 
-                if (segmentEnds->length > 0) {
-                    double *num = efflist_get(segmentEnds, segmentEnds->length-1);
-                    if (num == NULL) {null_fail();}
-                    *num--;
-                }
+static PyObject *sliderpath_calculate_paths(PyObject *self, PyObject *args) {
+    PyObject *rawPoints, *rawSegmentOffsets, *rawSliderOffsets, *rawCurveTypes, *rawExpectedDistances;
+    PyObject *rawPrecision = NULL;
+    PathPrecision precision;
 
-                lastLength = list_get(cumulativeLength, cumulativeLength->length-1);
-                if (lastLength == NULL) {null_fail();}
-            }
-        }
+    if (!PyArg_ParseTuple(args, "OOOOO|O:calculate_paths", &rawPoints, &rawSegmentOffsets, &rawSliderOffsets,
+        &rawCurveTypes, &rawExpectedDistances, &rawPrecision)) {
+        null_fail();
+    }
+    if (!parse_precision(rawPrecision, &precision, "calculate_paths")) {null_fail();}
+
+    PyObject *output = NULL;
+    Py_buffer pointsView = {0}, segmentOffsetsView = {0}, sliderOffsetsView = {0}, curveTypesView = {0},
+        expectedDistancesView = {0};
+    List *pathOut = list_init(sizeof(Vector2));
+    List *distanceOut = list_init(sizeof(double));
+    List *segmentEndOut = list_init(sizeof(double));
+    List *pathOffsets = list_init(sizeof(int64_t));
+    List *distanceOffsets = list_init(sizeof(int64_t));
+    List *failed = list_init(sizeof(uint8_t));
+    PathBuffers buffers = {list_init(sizeof(Vector2)), list_init(sizeof(Vector2)), list_init(sizeof(double))};
+    if (pathOut == NULL || distanceOut == NULL || segmentEndOut == NULL || pathOffsets == NULL ||
+        distanceOffsets == NULL || failed == NULL || buffers.subpath == NULL || buffers.path == NULL ||
+        buffers.cumulativeLength == NULL) {
+        PyErr_NoMemory();
+        fail();
+        goto release;
+    }
+    if (!get_input_buffer(rawPoints, &pointsView, sizeof(Vector2), 'd', "points") ||
+        !get_input_buffer(rawSegmentOffsets, &segmentOffsetsView, sizeof(int64_t), 'q', "segment_offsets") ||
+        !get_input_buffer(rawSliderOffsets, &sliderOffsetsView, sizeof(int64_t), 'q', "slider_offsets") ||
+        !get_input_buffer(rawCurveTypes, &curveTypesView, sizeof(int64_t), 'q', "curve_types") ||
+        !get_input_buffer(rawExpectedDistances, &expectedDistancesView, sizeof(double), 'd', "expected_distances")) {
+        fail();
+        goto release;
+    }
 
-        if (pathEndIndex <= 0) {
-            double zero = 0;
-            if (!list_append(cumulativeLength, &zero, sizeof zero)) {null_fail();}
-            goto return_values;
-        }
+    Vector2 *points = pointsView.buf;
+    int64_t *segmentOffsets = segmentOffsetsView.buf;
+    int64_t *sliderOffsets = sliderOffsetsView.buf;
+    int64_t *curveTypes = curveTypesView.buf;
+    double *expectedDistances = expectedDistancesView.buf;
+    size_t pointCount = pointsView.len / sizeof(Vector2);
+    size_t segmentCount = segmentOffsetsView.len / sizeof(int64_t) - 1;
+    size_t sliderCount = curveTypesView.len / sizeof(int64_t);
+
+    // Check the offsets up front so the loop can index without bounds checks
+    bool valid = segmentOffsetsView.len >= (Py_ssize_t)sizeof(int64_t) &&
+        (size_t)sliderOffsetsView.len == (sliderCount + 1) * sizeof(int64_t) &&
+        (size_t)expectedDistancesView.len == sliderCount * sizeof(double) &&
+        sliderOffsets[0] == 0 && (size_t)sliderOffsets[sliderCount] == segmentCount &&
+        segmentOffsets[0] == 0 && (size_t)segmentOffsets[segmentCount] == pointCount;
+    for (size_t i=0; valid && i<segmentCount; i++) {
+        valid = segmentOffsets[i+1] > segmentOffsets[i];
+    }
+    for (size_t i=0; valid && i<sliderCount; i++) {
+        valid = sliderOffsets[i+1] > sliderOffsets[i];
+    }
+    if (!valid) {
+        PyErr_SetString(PyExc_ValueError, "Invalid offsets given to calculate_paths");
+        fail();
+        goto release;
+    }
 
-        Vector2 *v1 = list_get(path, pathEndIndex);
-        Vector2 *v2 = list_get(path, pathEndIndex-1);
-        if (v1 == NULL || v2 == NULL) {null_fail();}
-        Vector2 *dir = vector2_init(v1->x - v2->x, v1->y - v2->y);
-        if (dir == NULL) {null_fail();}
-        vector2_normalize(dir);
-
-        double *lastLength = list_get(cumulativeLength, cumulativeLength->length-1);
-        if (lastLength == NULL) {null_fail();}
-        dir->x *= expectedDistance - *lastLength;
-        dir->x += v2->x;
-        dir->y *= expectedDistance - *lastLength;
-        dir->y += v2->y;
-
-        if (!list_set(path, pathEndIndex, dir, sizeof *dir)) {null_fail();}
-        if (!list_append(cumulativeLength, &expectedDistance, sizeof expectedDistance)) {null_fail();}
-    }
-
-return_values:
-
-    PyObject *output = PyList_New(3);
-    PyObject *newPath = PyList_New(path->length);
-    PyObject *newSegmentEnds = PyList_New(segmentEnds->length);
-    PyObject *newCumulativeLength = PyList_New(cumulativeLength->length);
-    size_t maxLength = max(max(path->length, segmentEnds->length), cumulativeLength->length); 
-    for (size_t i=0; i<maxLength; i++) {
-        if (i<path->length) {
-            Vector2 *point = list_get(path, i);
-            if (point == NULL) {null_fail();}
-            PyList_SetItem(newPath, i, PyTuple_Pack(2, PyFloat_FromDouble(point->x), 
-                PyFloat_FromDouble(point->y)));
-        }
-        if (i<segmentEnds->length) {
-            double *num = efflist_get(segmentEnds, i);
-            if (num == NULL) {null_fail();}
-            PyList_SetItem(newSegmentEnds, i, PyFloat_FromDouble(*num));
-        }
-        if (i<cumulativeLength->length) {
-            double *num = list_get(cumulativeLength, i);
-            if (num == NULL) {null_fail();}
-            PyList_SetItem(newCumulativeLength, i, PyFloat_FromDouble(*num));
+    // Every slider is calculated with the GIL released, the input buffers stay held until release
+    int64_t zero = 0;
+    double nan = NAN;
+    bool success = list_reserve(segmentEndOut, segmentCount) && list_reserve(pathOffsets, sliderCount + 1) &&
+        list_reserve(distanceOffsets, sliderCount + 1) && list_reserve(failed, sliderCount) &&
+        list_append(pathOffsets, &zero) && list_append(distanceOffsets, &zero);
+    Py_BEGIN_ALLOW_THREADS
+    for (size_t i=0; success && i<sliderCount; i++) {
+        size_t sliderSegments = (size_t)(sliderOffsets[i+1] - sliderOffsets[i]);
+        size_t pathStart = pathOut->length;
+        size_t distanceStart = distanceOut->length;
+        size_t segmentEndStart = segmentEndOut->length;
+        uint8_t sliderFailed = !calculate_path_core(points, segmentOffsets + sliderOffsets[i], sliderSegments,
+            curveTypes[i], expectedDistances[i], &precision, &buffers, pathOut, distanceOut, segmentEndOut);
+        if (sliderFailed) {
+            // Only this slider fails, it gets an empty path and NaN segment ends
+            pathOut->length = pathStart;
+            distanceOut->length = distanceStart;
+            segmentEndOut->length = segmentEndStart;
+            for (size_t j=0; success && j<sliderSegments; j++) {
+                success = list_append(segmentEndOut, &nan);
+            }
         }
+        success = success && list_append(failed, &sliderFailed);
+        int64_t pathEnd = pathOut->length;
+        int64_t distanceEnd = distanceOut->length;
+        success = success && list_append(pathOffsets, &pathEnd) && list_append(distanceOffsets, &distanceEnd);
     }
-    PyList_SetItem(output, 0, newPath);
-    PyList_SetItem(output, 1, newSegmentEnds);
-    PyList_SetItem(output, 2, newCumulativeLength);
+    Py_END_ALLOW_THREADS
+    if (!success) {
+        fail();
+        calculation_failed("calculate_paths");
+        goto release;
+    }
+
+    output = Py_BuildValue("(NNNNNN)", list_to_bytes(pathOut), list_to_bytes(pathOffsets),
+        list_to_bytes(distanceOut), list_to_bytes(distanceOffsets), list_to_bytes(segmentEndOut),
+        list_to_bytes(failed));
+
+release:
+    if (pathOut != NULL) {list_free(pathOut);}
+    if (distanceOut != NULL) {list_free(distanceOut);}
+    if (segmentEndOut != NULL) {list_free(segmentEndOut);}
+    if (pathOffsets != NULL) {list_free(pathOffsets);}
+    if (distanceOffsets != NULL) {list_free(distanceOffsets);}
+    if (failed != NULL) {list_free(failed);}
+    if (buffers.subpath != NULL) {list_free(buffers.subpath);}
+    if (buffers.path != NULL) {list_free(buffers.path);}
+    if (buffers.cumulativeLength != NULL) {list_free(buffers.cumulativeLength);}
+    bezier_buffers_free(&buffers.bezier);
+    PyBuffer_Release(&pointsView);
+    PyBuffer_Release(&segmentOffsetsView);
+    PyBuffer_Release(&sliderOffsetsView);
+    PyBuffer_Release(&curveTypesView);
+    PyBuffer_Release(&expectedDistancesView);
     return output;
 }
 
@@ -499,6 +743,7 @@ static PyMethodDef sliderpath_methods[] = {
     {"approximate_catmull", sliderpath_approximate_catmull, METH_VARARGS},
     {"approximate_circular_arc", sliderpath_approximate_circular_arc, METH_VARARGS},
     {"calculate_length", sliderpath_calculate_length, METH_VARARGS},
+    {"calculate_paths", sliderpath_calculate_paths, METH_VARARGS},
     {NULL, NULL}
 };
 
@@ -9,5 +9,7 @@
 #define fail() printf("File \"%s\", line %d, in %s\n", __FILE_NAME__, __LINE__, __func__)
 #define bool_fail() fail();return false
 #define null_fail() fail();return NULL
+// Not every compiler has max in its headers
+#define MAX(a, b) ((a) > (b) ? (a) : (b))
 
 #endif /* ~UTIL_H */
@@ -1,5 +1,4 @@
 #include "vector.h"
-#include "Python.h"
 #include "util.h"
 #include <math.h>
 #include <stdlib.h>
@@ -8,7 +7,6 @@
 extern Vector2 *vector2_init(double x, double y) {
     Vector2 *v = malloc(sizeof(Vector2));
     if (v == NULL) {
-        PyErr_SetString(PyExc_MemoryError, "Failed to create a Vector2 object due to malloc failing");
         null_fail();
     }
     v->x = x;
@@ -9,10 +9,16 @@ def confirm(path):
     return not bool(options.index(m) % 2)
 
 
+def iter_beatmap_files(path):
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.endswith(".osu") and not entry.is_dir():
+                yield entry.path
+
+
 def is_beatmapset(path):
-    for file in os.listdir(path):
-        if file.endswith(".osu") and not os.path.isdir(os.path.join(path, file)):
-            return True
+    for _ in iter_beatmap_files(path):
+        return True
     return False
 
 
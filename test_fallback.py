@@ -0,0 +1,52 @@
+from beatmap_reader import Beatmap, HitObjectType
+from beatmap_reader import sliderpath, sliderpath_numpy
+from beatmap_reader.path import SliderPath
+from time import perf_counter
+import numpy as np
+import glob
+import os
+import sys
+
+
+def pack(paths):
+    # Same packing as path.calculate_paths
+    points, segment_offsets, slider_offsets = [], [0], [0]
+    for path in paths:
+        for segment in path.get_segments():
+            points.extend(SliderPath.get_primitive_points(segment))
+            segment_offsets.append(len(points))
+        slider_offsets.append(len(segment_offsets) - 1)
+    return (
+        np.array(points, dtype=np.float64), np.array(segment_offsets, dtype=np.int64),
+        np.array(slider_offsets, dtype=np.int64), np.array([int(path.type) for path in paths], dtype=np.int64),
+        np.array([path.expected_distance for path in paths], dtype=np.float64)
+    )
+
+
+songs = sys.argv[1]
+c_time = numpy_time = 0
+mismatches = 0
+paths = glob.glob(os.path.join(songs, "*", "*.osu"))
+for path in paths:
+    beatmap = Beatmap.from_path(path)
+    if not beatmap.load():
+        continue
+    args = pack([obj.path for obj in beatmap.hit_objects if obj.type == HitObjectType.SLIDER])
+    if len(args[3]) == 0:
+        continue
+
+    t = perf_counter()
+    c_result = sliderpath.calculate_paths(*args)
+    c_time += perf_counter() - t
+    t = perf_counter()
+    numpy_result = sliderpath_numpy.calculate_paths(*args)
+    numpy_time += perf_counter() - t
+
+    dtypes = (np.float64, np.int64, np.float64, np.int64, np.float64)
+    if not all(np.array_equal(np.frombuffer(a, dtype=dtype), np.ravel(b), equal_nan=True)
+               for a, b, dtype in zip(c_result, numpy_result, dtypes)):
+        mismatches += 1
+        print(f"Mismatch in {path}")
+
+print(f"Compared {len(paths)} beatmaps, {mismatches} mismatches")
+print(f"sliderpath: {c_time:.3f}s, NumPy fallback: {numpy_time:.3f}s")
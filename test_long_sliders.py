@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from time import perf_counter
+import importlib.util
+import numpy as np
+import types
+import random
+import sys
+
+
+# Times long sliders with the built sliderpath extension. Pass the path of another
+# build, e.g. one from before the list rewrite, to time that instead and compare:
+#   python test_long_sliders.py old/sliderpath.cpython-311-x86_64-linux-gnu.so
+def load_build(path):
+    spec = importlib.util.spec_from_file_location("beatmap_reader.sliderpath", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    try:
+        module.approximate_bezier(np.zeros((2, 2)), None)
+    except TypeError:
+        # Builds from before path precision, which take no precision argument
+        wrapped = types.ModuleType(spec.name)
+        wrapped.calculate_length = module.calculate_length
+        for name in ("approximate_bezier", "approximate_catmull", "approximate_circular_arc", "calculate_paths"):
+            func = getattr(module, name)
+            setattr(wrapped, name, lambda *args, func=func: func(*args[:-1]))
+        return wrapped, False
+    return module, True
+
+
+supports_precision = True
+if len(sys.argv) > 1:
+    sys.modules["beatmap_reader.sliderpath"], supports_precision = load_build(sys.argv[1])
+    print(f"Using {sys.argv[1]}")
+
+from beatmap_reader.path import SliderPath, calculate_paths
+
+
+def make_slider(curve_type, control_points, length, segment_length=None):
+    # Control points wander across the playfield, repeating a point every
+    # segment_length points to split the curve into segments
+    points = []
+    for i in range(control_points):
+        point = f"{random.randint(0, 512)}:{random.randint(0, 384)}"
+        points.append(point)
+        if segment_length is not None and i % segment_length == segment_length - 1:
+            points.append(point)
+    parent = SimpleNamespace(x=random.randint(0, 512), y=random.randint(0, 384), length=length)
+    return SliderPath(curve_type + "|" + "|".join(points), parent)
+
+
+random.seed(0)
+cases = {
+    "Long bezier (30 points)": [make_slider("B", 30, 5000) for _ in range(200)],
+    "Many segments (100 x 4 points)": [make_slider("B", 400, 20000, 4) for _ in range(100)],
+    "Long catmull (50 points)": [make_slider("C", 50, 8000) for _ in range(200)],
+    "Perfect circles": [make_slider("P", 2, 300) for _ in range(5000)],
+}
+
+for name, paths in cases.items():
+    t = perf_counter()
+    for path in paths:
+        path.calculate()
+    single_time = perf_counter() - t
+    t = perf_counter()
+    calculate_paths(paths)
+    batch_time = perf_counter() - t
+    points = sum(len(path.calculated_path) for path in paths)
+    print(f"{name}: {points} points, SliderPath.calculate {single_time:.3f}s, calculate_paths {batch_time:.3f}s")
+    if not supports_precision:
+        continue
+    t = perf_counter()
+    calculate_paths(paths, precision="fast")
+    fast_time = perf_counter() - t
+    points = sum(len(path.calculated_path) for path in paths)
+    print(f"  fast precision: {points} points, calculate_paths {fast_time:.3f}s")
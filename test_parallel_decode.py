@@ -0,0 +1,47 @@
+from beatmap_reader import OsuCache
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+import os
+import sys
+
+
+osu_db_path = sys.argv[1]
+worker_counts = sorted({1, 2, 4, os.cpu_count() or 1})
+
+
+def timed(name, func, base_time=None):
+    t = perf_counter()
+    result = func()
+    elapsed = perf_counter() - t
+    speedup = f" (speedup {base_time / elapsed:.2f}x)" if base_time else ""
+    print(f"{name}: {elapsed:.3f}s{speedup}")
+    return result, elapsed
+
+
+def key(beatmap):
+    return beatmap.md5_hash, beatmap.beatmap_id, beatmap.title, beatmap.diff_star_rating_standard
+
+
+print(f"Decoding {osu_db_path} on {os.cpu_count()} cores...")
+osu_cache, base_time = timed("Serial", lambda: OsuCache.from_path(osu_db_path))
+expected = list(map(key, osu_cache.beatmaps))
+for workers in worker_counts:
+    for use_threads in (False, True):
+        name = f"load_parallel, {workers} {'threads' if use_threads else 'processes'}"
+        result, _ = timed(name, lambda: OsuCache.load_parallel(osu_db_path, workers, use_threads=use_threads),
+                          base_time)
+        assert list(map(key, result.beatmaps)) == expected, name
+
+columns, base_time = timed("to_columns", lambda: osu_cache.to_columns())
+for workers in worker_counts:
+    result, _ = timed(f"to_columns, {workers} processes",
+                      lambda: osu_cache.to_columns(True, workers), base_time)
+    assert result.md5_hash.tolist() == columns.md5_hash.tolist()
+
+# Records of a lazy cache are decoded from one shared buffer, so decode them from
+# several threads at once and check none of them read another's record
+lazy_cache = OsuCache.open(osu_db_path)
+with ThreadPoolExecutor(8) as executor:
+    decoded = list(executor.map(lazy_cache.beatmaps.get, range(len(lazy_cache.beatmaps))))
+assert list(map(key, decoded)) == expected
+print(f"{len(decoded)} records decoded by 8 threads from one lazy cache match")
@@ -0,0 +1,127 @@
+from beatmap_reader import sliderpath, sliderpath_numpy
+from beatmap_reader.path import SliderPath, calculate_paths, FAST_PRECISION
+from types import SimpleNamespace
+import numpy as np
+import random
+
+
+# Checks that the NumPy fallback gives exactly the same results as the sliderpath
+# extension, on random sliders including the degenerate cases
+
+def random_points(count, spread=512):
+    return [(random.randint(0, spread), random.randint(0, spread)) for _ in range(count)]
+
+
+def make_slider(curve_type, points, length):
+    head, points = points[0], points[1:]
+    parent = SimpleNamespace(x=head[0], y=head[1], length=length)
+    return SliderPath(curve_type + "|" + "|".join(f"{x}:{y}" for x, y in points), parent)
+
+
+def make_sliders(count):
+    sliders = []
+    for _ in range(count):
+        curve_type = random.choice("LPBC")
+        kind = random.random()
+        if kind < 0.1:
+            # Collinear or repeated points, which circular arcs fall back to bezier for
+            x, y = random.randint(0, 512), random.randint(0, 384)
+            points = [(x, y), (x + 10, y + 10), (x + 20, y + 20)] if kind < 0.05 else [(x, y)] * 3
+        elif kind < 0.3:
+            # Several segments split by repeated points
+            points = []
+            for _ in range(random.randint(2, 5)):
+                points.extend(random_points(random.randint(2, 4)))
+                points.append(points[-1])
+        else:
+            points = random_points(3 if curve_type == "P" else random.randint(2, 12), random.choice((16, 512)))
+        sliders.append(make_slider(curve_type, points, random.choice((0, 1, 50, 300, 2000))))
+    return sliders
+
+
+def pack(paths):
+    # Same packing as path._calculate_packed
+    points, segment_offsets, slider_offsets = [], [0], [0]
+    for path in paths:
+        for segment in path.get_segments():
+            points.extend(SliderPath.get_primitive_points(segment))
+            segment_offsets.append(len(points))
+        slider_offsets.append(len(segment_offsets) - 1)
+    return [
+        np.array(points, dtype=np.float64), np.array(segment_offsets, dtype=np.int64),
+        np.array(slider_offsets, dtype=np.int64), np.array([int(path.type) for path in paths], dtype=np.int64),
+        np.array([path.expected_distance for path in paths], dtype=np.float64)
+    ]
+
+
+def as_array(value, dtype=np.float64):
+    if isinstance(value, bytes):
+        return np.frombuffer(value, dtype=dtype)
+    return np.ravel(np.asarray(value, dtype=dtype))
+
+
+def call(func, *args):
+    try:
+        return func(*args)
+    except ValueError:
+        return ValueError
+
+
+def assert_same(a, b, message, dtype=np.float64):
+    if a is ValueError or b is ValueError:
+        assert a is b, message
+    else:
+        assert np.array_equal(as_array(a, dtype), as_array(b, dtype), equal_nan=True), message
+
+
+random.seed(0)
+sliders = make_sliders(2000)
+for precision in (None, FAST_PRECISION):
+    for path in sliders:
+        for segment in path.get_segments():
+            points = np.array(SliderPath.get_primitive_points(segment), dtype=np.float64)
+            names = ["approximate_bezier", "approximate_catmull"]
+            if len(points) == 3:
+                names.append("approximate_circular_arc")
+            for name in names:
+                assert_same(call(getattr(sliderpath, name), points, precision),
+                             call(getattr(sliderpath_numpy, name), points, precision), f"{name} of {points.tolist()}")
+
+        points = np.array(SliderPath.get_primitive_points(path.points), dtype=np.float64)
+        approximated = np.frombuffer(sliderpath.approximate_bezier(points, precision)).reshape(-1, 2)
+        segment_ends = np.array([len(approximated) - 1], dtype=np.float64)
+        c_result = call(sliderpath.calculate_length, points, approximated, segment_ends, path.expected_distance)
+        numpy_result = call(sliderpath_numpy.calculate_length, points, approximated, segment_ends,
+                            path.expected_distance)
+        if c_result is ValueError or numpy_result is ValueError:
+            assert c_result is numpy_result, f"calculate_length of {points.tolist()}"
+        else:
+            for a, b in zip(c_result, numpy_result):
+                assert_same(a, b, f"calculate_length of {points.tolist()}")
+
+    args = pack(sliders) + [precision]
+    outputs = sliderpath.calculate_paths(*args), sliderpath_numpy.calculate_paths(*args)
+    for i, (a, b) in enumerate(zip(*outputs)):
+        assert_same(a, b, f"calculate_paths output {i}", {1: np.int64, 3: np.int64, 5: np.uint8}.get(i, np.float64))
+    # Sliders of length 0 fail on their own without failing the batch
+    assert 0 < np.count_nonzero(as_array(outputs[0][5], np.uint8)) < len(sliders)
+
+# A slider that fails raises the same error as calculating it on its own, once the
+# rest of the batch has been calculated
+try:
+    calculate_paths(sliders)
+except ValueError:
+    pass
+else:
+    raise AssertionError("calculate_paths didn't raise for the sliders that failed")
+assert all(path.calculated for path in sliders if path.expected_distance > 0)
+
+# calculate_paths gives the same paths as calculating each slider on its own
+sliders = [path for path in sliders if path.expected_distance > 0]
+calculate_paths(sliders)
+batched = [np.array(path.calculated_path) for path in sliders]
+for path, calculated_path in zip(sliders, batched):
+    path.calculate()
+    assert np.array_equal(path.calculated_path, calculated_path)
+
+print("sliderpath and sliderpath_numpy match")
@@ -0,0 +1,53 @@
+from beatmap_reader import BeatmapReader
+from time import perf_counter
+import glob
+import os
+import sys
+
+
+def legacy_load_beatmap_data(path):
+    # The old text based tokenizer, kept here to compare against
+    data = {}
+    with open(path, "r", encoding="utf-8") as f:
+        current_section = None
+        for line in f.readlines():
+            line = line[:-1]
+            ascii_line = "".join(filter(lambda char: char.isascii(), line))
+            if line.strip() == "" or line.startswith("//"):
+                continue
+            if current_section is None and ascii_line.startswith("osu file format"):
+                data.update({"version": int(ascii_line[17:].strip())})
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                current_section = line[1:-1]
+                data.update({current_section: {} if current_section in BeatmapReader.key_value_sections else []})
+                continue
+            if current_section is None:
+                continue
+            if current_section in BeatmapReader.key_value_sections:
+                split = line.split(":")
+                key = split[0].strip()
+                value = ":".join(split[1:]).strip()
+
+                data[current_section].update({key: value})
+            else:
+                data[current_section].append(line.strip())
+    return data
+
+
+songs = sys.argv[1]
+paths = glob.glob(os.path.join(songs, "*", "*.osu"))
+print(f"Tokenizing {len(paths)} beatmaps...")
+
+t = perf_counter()
+for path in paths:
+    legacy_load_beatmap_data(path)
+legacy_time = perf_counter() - t
+print(f"Legacy tokenizer: {legacy_time:.3f}s ({legacy_time / len(paths) * 1000:.3f}ms per map)")
+
+t = perf_counter()
+for path in paths:
+    BeatmapReader(path).load_beatmap_data()
+new_time = perf_counter() - t
+print(f"Byte tokenizer: {new_time:.3f}s ({new_time / len(paths) * 1000:.3f}ms per map)")
+print(f"Speedup: {legacy_time / new_time:.2f}x")
@@ -0,0 +1,27 @@
+from beatmap_reader import Beatmap
+from time import perf_counter
+import glob
+import os
+import sys
+
+
+songs = sys.argv[1]
+thread_counts = [1, 2, 4, 8, os.cpu_count() or 1]
+beatmaps = []
+for path in glob.glob(os.path.join(songs, "*", "*.osu")):
+    beatmap = Beatmap.from_path(path)
+    if beatmap.load():
+        beatmaps.append(beatmap)
+print(f"Calculating slider paths of {len(beatmaps)} beatmaps on {os.cpu_count()} cores...")
+# Warm up first so the single threaded run isn't paying for it
+for beatmap in beatmaps:
+    beatmap.load_slider_paths()
+
+base_time = None
+for threads in sorted(set(thread_counts)):
+    t = perf_counter()
+    for beatmap in beatmaps:
+        beatmap.load_slider_paths(threads)
+    elapsed = perf_counter() - t
+    base_time = base_time or elapsed
+    print(f"{threads} threads: {elapsed:.3f}s (speedup {base_time / elapsed:.2f}x)")